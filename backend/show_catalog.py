@@ -3,56 +3,93 @@ Display catalog items by category for Day 7 agent
 """
 
 import json
+import sys
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from collections import defaultdict
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to loading the whole file
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if ijson else (json.JSONDecodeError,)
+
+
+def iter_catalog(f):
+    """Yield catalog items, streaming them from the file when ijson is installed."""
+    if ijson is not None:
+        return ijson.items(f, "item", use_float=True)
+    return iter(load_json(f))
+
+
+def load_json(f):
+    """Parse a whole JSON file opened in binary mode."""
+    if orjson is not None:
+        return orjson.loads(f.read())
+    return json.load(f)
+
 
 def display_catalog():
     catalog_path = Path(__file__).parent / "catalog.json"
     
     try:
-        with open(catalog_path, "r") as f:
-            catalog = json.load(f)
+        # Index by id and collect tags while streaming
+        catalog = []
+        id_to_item = {}
+        all_tags = set()
+        with open(catalog_path, "rb") as f:
+            add_tags = all_tags.update
+            for item in iter_catalog(f):
+                catalog.append(item)
+                id_to_item[item["id"]] = item
+                tags = item.get("tags")
+                if tags:
+                    add_tags(tags)
+        
+        # Sort once so categories and their items come out in display order
+        catalog.sort(key=itemgetter("category", "name"))
         
-        # Group by category
-        by_category = defaultdict(list)
-        for item in catalog:
-            by_category[item["category"]].append(item)
+        # Lay the display fields out as columns so the print loop does no dict work
+        categories = [item["category"] for item in catalog]
+        names = [item["name"] for item in catalog]
+        brands = [item["brand"] for item in catalog]
+        sizes = [item["size"] for item in catalog]
+        prices = [item["price"] for item in catalog]
+        stock_flags = ["✓" if item.get("in_stock", False) else "✗" for item in catalog]
+        tag_strs = [f" [{', '.join(item['tags'])}]" if item.get("tags") else "" for item in catalog]
         
         print("\n" + "=" * 70)
         print("FRESHMART PRODUCT CATALOG")
         print("=" * 70 + "\n")
         
-        for category in sorted(by_category.keys()):
-            items = by_category[category]
-            print(f"\n📦 {category.upper()} ({len(items)} items)")
-            print("-" * 70)
+        for category, group in groupby(range(len(catalog)), key=categories.__getitem__):
+            indices = list(group)
+            lines = [f"\n📦 {category.upper()} ({len(indices)} items)\n", "-" * 70 + "\n"]
             
-            for item in sorted(items, key=lambda x: x["name"]):
-                tags_str = ""
-                if item.get("tags"):
-                    tags_str = f" [{', '.join(item['tags'])}]"
-                
-                stock_status = "✓" if item.get("in_stock", False) else "✗"
-                
-                print(f"  {stock_status} {item['name']}")
-                print(f"     {item['brand']} | {item['size']} | ${item['price']}{tags_str}")
+            for idx in indices:
+                lines.append(f"  {stock_flags[idx]} {names[idx]}\n")
+                lines.append(f"     {brands[idx]} | {sizes[idx]} | ${prices[idx]}{tag_strs[idx]}\n")
+            
+            # One write per category instead of two prints per item
+            sys.stdout.write("".join(lines))
         
         print("\n" + "=" * 70)
         print(f"Total Items: {len(catalog)}")
         
-        # Count tags
-        all_tags = set()
-        for item in catalog:
-            all_tags.update(item.get("tags", []))
-        
         print(f"Dietary Tags: {', '.join(sorted(all_tags))}")
         print("=" * 70 + "\n")
         
         # Show recipes
         history_path = Path(__file__).parent / "order_history.json"
         if history_path.exists():
-            with open(history_path, "r") as f:
-                history = json.load(f)
+            with open(history_path, "rb") as f:
+                history = load_json(f)
             
             recipes = history.get("recipes", {})
             if recipes:
@@ -62,22 +99,17 @@ def display_catalog():
                 
                 for recipe_name, item_ids in sorted(recipes.items()):
                     print(f"🍽️  '{recipe_name}'")
-                    items_in_recipe = []
                     for item_id in item_ids:
-                        for item in catalog:
-                            if item["id"] == item_id:
-                                items_in_recipe.append(item["name"])
-                                break
-                    
-                    for item_name in items_in_recipe:
-                        print(f"     - {item_name}")
+                        item = id_to_item.get(item_id)
+                        if item:
+                            print(f"     - {item['name']}")
                     print()
                 
                 print("=" * 70 + "\n")
     
     except FileNotFoundError:
         print("❌ Catalog file not found. Please run from backend directory.")
-    except json.JSONDecodeError:
+    except JSON_ERRORS:
         print("❌ Invalid JSON in catalog file")
     except Exception as e:
         print(f"❌ Error: {e}")
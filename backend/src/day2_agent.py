@@ -1,5 +1,7 @@
+import asyncio
 import logging
 import json
+import re
 from datetime import datetime
 from pathlib import Path
 
@@ -30,6 +32,92 @@ load_dotenv(".env.local")
 ORDERS_DIR = Path(__file__).parent.parent / "orders"
 ORDERS_DIR.mkdir(exist_ok=True)
 
+# Characters replaced when a customer name is used in an order filename
+UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+# How long to wait for more order updates in the same turn before publishing the visualization
+DISPLAY_DEBOUNCE_SECONDS = 0.05
+
+# Cup heights for the drink visualization
+CUP_HEIGHTS = {"small": "120px", "medium": "150px", "large": "180px"}
+
+# Drink colors keyed by a substring of the drink type, highest precedence first
+DRINK_COLORS = {
+    "espresso": "#3b2f2f",
+    "black": "#3b2f2f",
+    "matcha": "#90EE90",
+    "milk": "#D2B48C",
+    "latte": "#D2B48C",  # Tan
+}
+
+# Static markup for the drink visualization; _generate_html only fills in the fields
+DRINK_HTML_TEMPLATE = """
+        <div style="font-family: sans-serif; text-align: center; padding: 20px; background: #f5f5f5; border-radius: 10px;">
+            <h2>Brew Haven Order</h2>
+            <div style="display: flex; justify-content: center; align-items: flex-end; height: 250px; margin: 20px 0;">
+                <div style="position: relative; width: 100px; height: {height}; background: {color}; border-radius: 0 0 15px 15px; border: 2px solid #333;">
+                    <div style="position: absolute; top: 10px; right: -20px; width: 20px; height: 40px; border: 2px solid #333; border-left: none; border-radius: 0 10px 10px 0;"></div>
+                    {extras_html}
+                </div>
+            </div>
+            <div style="background: white; padding: 10px; border-radius: 5px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
+                <p><strong>Name:</strong> {name}</p>
+                <p><strong>Drink:</strong> {drink}</p>
+                <p><strong>Size:</strong> {size}</p>
+                <p><strong>Milk:</strong> {milk}</p>
+                <p><strong>Extras:</strong> {extras}</p>
+            </div>
+        </div>
+        """
+
+
+# Most orders written per background flush
+ORDER_WRITE_BATCH = 32
+
+# Background order writer shared by all sessions in this worker process
+_order_queue: asyncio.Queue | None = None
+_order_writer: asyncio.Task | None = None
+
+
+def _write_order_files(batch: list[tuple[Path, str]]) -> None:
+    """Write a batch of serialized orders to disk (runs in a worker thread)."""
+    for filepath, payload in batch:
+        with open(filepath, 'w') as f:
+            f.write(payload)
+
+
+async def _run_order_writer(queue: asyncio.Queue):
+    """Drain queued orders and write them in batches off the event loop."""
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < ORDER_WRITE_BATCH and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            await asyncio.to_thread(_write_order_files, batch)
+            for filepath, _ in batch:
+                logger.info(f"Order saved: {filepath}")
+        except Exception as e:
+            logger.error(f"Failed to save orders: {e}")
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+def queue_order_write(filepath: Path, payload: str) -> None:
+    """Hand an order to the background writer, starting it if needed."""
+    global _order_queue, _order_writer
+    loop = asyncio.get_running_loop()
+    if _order_writer is None or _order_writer.done() or _order_writer.get_loop() is not loop:
+        _order_queue = asyncio.Queue()
+        _order_writer = asyncio.create_task(_run_order_writer(_order_queue))
+    _order_queue.put_nowait((filepath, payload))
+
+
+async def flush_order_writes():
+    """Wait until every queued order has been written."""
+    if _order_queue is not None and _order_writer is not None and not _order_writer.done():
+        await _order_queue.join()
+
 
 class Assistant(Agent):
     def __init__(self, room: rtc.Room) -> None:
@@ -59,15 +147,36 @@ class Assistant(Agent):
             "extras": [],
             "name": None
         }
+        # Order fields shown in the last published visualization
+        self._last_display_key = None
+        # Pending debounced publish, if any
+        self._display_task: asyncio.Task | None = None
+
+    def _schedule_display_update(self) -> None:
+        """Publish the visualization shortly, coalescing updates made in quick succession."""
+        if self._display_task is None:
+            self._display_task = asyncio.create_task(self._flush_display())
+
+    async def _flush_display(self):
+        await asyncio.sleep(DISPLAY_DEBOUNCE_SECONDS)
+        # Clear first so updates arriving while we publish schedule another frame
+        self._display_task = None
+        await self._update_display()
 
     async def _update_display(self):
         """Generate HTML and publish it to the room."""
+        state = self.order_state
+        display_key = (state["drinkType"], state["size"], state["milk"], tuple(state["extras"]), state["name"])
+        if display_key == self._last_display_key:
+            return
+        
         html = self._generate_html()
         try:
             await self.room.local_participant.publish_data(
                 payload=html.encode("utf-8"),
                 topic="drink_visualization"
             )
+            self._last_display_key = display_key
             logger.info("Published drink visualization")
         except Exception as e:
             logger.error(f"Failed to publish data: {e}")
@@ -77,17 +186,11 @@ class Assistant(Agent):
         state = self.order_state
         
         # Determine cup size
-        height = "150px" # Default medium
-        if state["size"] == "small": height = "120px"
-        if state["size"] == "large": height = "180px"
+        height = CUP_HEIGHTS.get(state["size"], "150px") # Default medium
         
-        # Determine drink color
-        color = "#6F4E37" # Coffee brown
+        # Determine drink color from the first table entry found in the drink type
         dtype = state["drinkType"] or ""
-        if "latte" in dtype: color = "#C8A2C8" # Light brown/beige (approx) - actually #D2B48C is tan
-        if "milk" in dtype: color = "#D2B48C"
-        if "matcha" in dtype: color = "#90EE90"
-        if "black" in dtype or "espresso" in dtype: color = "#3b2f2f"
+        color = next((c for word, c in DRINK_COLORS.items() if word in dtype), "#6F4E37") # Coffee brown
         
         # Extras visuals
         extras_html = ""
@@ -99,25 +202,16 @@ class Assistant(Agent):
         if state['name']:
             summary += f" for {state['name']}"
             
-        html = f"""
-        <div style="font-family: sans-serif; text-align: center; padding: 20px; background: #f5f5f5; border-radius: 10px;">
-            <h2>Brew Haven Order</h2>
-            <div style="display: flex; justify-content: center; align-items: flex-end; height: 250px; margin: 20px 0;">
-                <div style="position: relative; width: 100px; height: {height}; background: {color}; border-radius: 0 0 15px 15px; border: 2px solid #333;">
-                    <div style="position: absolute; top: 10px; right: -20px; width: 20px; height: 40px; border: 2px solid #333; border-left: none; border-radius: 0 10px 10px 0;"></div>
-                    {extras_html}
-                </div>
-            </div>
-            <div style="background: white; padding: 10px; border-radius: 5px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-                <p><strong>Name:</strong> {state['name'] or '...'}</p>
-                <p><strong>Drink:</strong> {state['drinkType'] or '...'}</p>
-                <p><strong>Size:</strong> {state['size'] or '...'}</p>
-                <p><strong>Milk:</strong> {state['milk'] or '...'}</p>
-                <p><strong>Extras:</strong> {', '.join(state['extras']) if state['extras'] else 'None'}</p>
-            </div>
-        </div>
-        """
-        return html
+        return DRINK_HTML_TEMPLATE.format(
+            height=height,
+            color=color,
+            extras_html=extras_html,
+            name=state['name'] or '...',
+            drink=state['drinkType'] or '...',
+            size=state['size'] or '...',
+            milk=state['milk'] or '...',
+            extras=', '.join(state['extras']) if state['extras'] else 'None',
+        )
 
     @function_tool
     async def save_order(self, context: RunContext):
@@ -145,20 +239,22 @@ class Assistant(Agent):
             return f"Cannot save order yet. Still missing: {', '.join(missing)}"
         
         # Create order with timestamp
+        now = datetime.now()
         order = {
             **self.order_state,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "status": "pending"
         }
         
-        # Save to JSON file
-        filename = f"order_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.order_state['name']}.json"
+        # Save to JSON file, keeping the customer name safe to use in a filename
+        safe_name = UNSAFE_FILENAME_CHARS.sub("_", self.order_state['name'])
+        filename = f"order_{now:%Y%m%d_%H%M%S}_{safe_name}.json"
         filepath = ORDERS_DIR / filename
         
-        with open(filepath, 'w') as f:
-            json.dump(order, f, indent=2)
+        # Written by the background writer so the spoken confirmation isn't held up by disk I/O
+        queue_order_write(filepath, json.dumps(order, indent=2))
         
-        logger.info(f"Order saved: {filepath}")
+        logger.info(f"Order queued: {filepath}")
         
         # Update display one last time
         await self._update_display()
@@ -183,7 +279,7 @@ Your order will be ready shortly!"""
         """
         self.order_state["drinkType"] = drink_type.lower()
         logger.info(f"Updated drink type: {drink_type}")
-        await self._update_display()
+        self._schedule_display_update()
         return f"Got it, {drink_type}"
 
     @function_tool
@@ -199,7 +295,7 @@ Your order will be ready shortly!"""
         
         self.order_state["size"] = size_lower
         logger.info(f"Updated size: {size}")
-        await self._update_display()
+        self._schedule_display_update()
         return f"Got it, {size}"
 
     @function_tool
@@ -211,7 +307,7 @@ Your order will be ready shortly!"""
         """
         self.order_state["milk"] = milk.lower()
         logger.info(f"Updated milk: {milk}")
-        await self._update_display()
+        self._schedule_display_update()
         return f"Got it, {milk}"
 
     @function_tool
@@ -224,7 +320,7 @@ Your order will be ready shortly!"""
         if extra.lower() not in self.order_state["extras"]:
             self.order_state["extras"].append(extra.lower())
             logger.info(f"Added extra: {extra}")
-            await self._update_display()
+            self._schedule_display_update()
             return f"Added {extra}"
         return f"{extra} is already in your order"
 
@@ -237,7 +333,7 @@ Your order will be ready shortly!"""
         """
         self.order_state["name"] = name
         logger.info(f"Updated name: {name}")
-        await self._update_display()
+        self._schedule_display_update()
         return f"Got it, {name}"
 
 
@@ -303,6 +399,7 @@ async def entrypoint(ctx: JobContext):
         logger.info(f"Usage: {summary}")
 
     ctx.add_shutdown_callback(log_usage)
+    ctx.add_shutdown_callback(flush_order_writes)
 
     # # Add a virtual avatar to the session, if desired
     # # For other providers, see https://docs.livekit.io/agents/models/avatar/
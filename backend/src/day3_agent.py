@@ -1,8 +1,11 @@
 import json
 import logging
+import os
+import re
 from datetime import datetime
 from pathlib import Path
 
+import fast_json
 from wellness_analytics import (
     calculate_goal_completion_rate,
     calculate_mood_trend,
@@ -10,6 +13,7 @@ from wellness_analytics import (
     get_common_stressors,
 )
 from mcp_tools import (
+    close_mcp_sessions,
     create_calendar_reminder,
     create_todoist_tasks,
     is_mcp_available,
@@ -39,49 +43,23 @@ logger = logging.getLogger("agent")
 
 load_dotenv(".env.local")
 
-# Create wellness log file path
-WELLNESS_LOG = Path(__file__).parent.parent / "wellness_log.json"
+# Create wellness log file path (JSON Lines, one check-in per line)
+WELLNESS_LOG = Path(__file__).parent.parent / "wellness_log.jsonl"
+# Check-ins were stored as a single JSON array before the log became append-only
+LEGACY_WELLNESS_LOG = Path(__file__).parent.parent / "wellness_log.json"
 
+# Parsed wellness log, keyed on the file's (mtime_ns, size) so reconnects skip re-parsing
+_HISTORY_CACHE: dict[tuple[int, int], list] = {}
 
-class WellnessCompanion(Agent):
-    def __init__(self, room: rtc.Room) -> None:
-        # Load history before setting instructions so we can personalize the greeting
-        self.history = self._load_history()
-
-        # Generate personalized instructions based on history
-        instructions = self._generate_instructions()
-
-        super().__init__(instructions=instructions)
-        self.room = room
-
-        # Initialize current session state
-        self.current_session = {
-            "date": datetime.now().isoformat(),
-            "mood": None,
-            "energy": None,
-            "stressors": [],
-            "goals": [],
-            "summary": None,
-        }
-
-    def _load_history(self) -> list:
-        """Load past check-ins from JSON file."""
-        if not WELLNESS_LOG.exists():
-            return []
+# Energy levels counted as high or low when summarizing mood trends
+HIGH_ENERGY = frozenset(("high", "energetic", "good"))
+LOW_ENERGY = frozenset(("low", "tired", "exhausted"))
 
-        try:
-            with open(WELLNESS_LOG) as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            logger.warning("Could not parse wellness log, starting fresh")
-            return []
-        except Exception as e:
-            logger.error(f"Error loading history: {e}")
-            return []
+# Splits a comma-separated stressor list, dropping the whitespace around each entry
+STRESSOR_SEPARATOR = re.compile(r"\s*,\s*")
 
-    def _generate_instructions(self) -> str:
-        """Generate personalized instructions based on history."""
-        base_instructions = """You are a supportive health and wellness companion. The user is interacting with you via voice.
+# Static part of the companion prompt; context from the last check-in is appended per session
+BASE_INSTRUCTIONS = """You are a supportive health and wellness companion. The user is interacting with you via voice.
 
 Your role is to conduct a brief, grounded daily check-in. You are NOT a clinician and should avoid giving medical advice or making diagnoses.
 
@@ -123,20 +101,112 @@ Keep your responses:
 
 Don't use complex formatting, emojis, or asterisks."""
 
-        # Add context from last session if available
-        if self.history:
-            last_session = self.history[-1]
-            context_note = f"\n\nContext from last check-in ({last_session.get('date', 'recent')}):\n"
-            if last_session.get("mood"):
-                context_note += f"- Mood: {last_session.get('mood')}\n"
-            if last_session.get("energy"):
-                context_note += f"- Energy: {last_session.get('energy')}\n"
-            if last_session.get("goals"):
-                context_note += f"- Goals: {', '.join(last_session.get('goals', []))}\n"
 
-            base_instructions += context_note
+def _parse_log_lines(lines) -> list:
+    """Parse JSON Lines check-ins, skipping blank and undecodable lines."""
+    sessions = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            sessions.append(fast_json.loads(line))
+        except json.JSONDecodeError:
+            # Skip a line left partly written by an interrupted append
+            continue
+    return sessions
+
+
+def _migrate_legacy_log() -> None:
+    """Move check-ins from an old JSON-array wellness log into the JSON Lines log.
+
+    Check-ins already in the JSON Lines log are kept after the migrated ones. The
+    log is replaced atomically and the legacy file is renamed only afterwards; one
+    that cannot be parsed is left in place so migration is retried on the next load.
+    """
+    try:
+        with open(LEGACY_WELLNESS_LOG, "rb") as f:
+            legacy = fast_json.loads(f.read())
+    except FileNotFoundError:
+        return
+    except json.JSONDecodeError:
+        logger.warning(f"Could not parse {LEGACY_WELLNESS_LOG.name}, leaving it for a later migration")
+        return
+
+    try:
+        with open(WELLNESS_LOG) as f:
+            current = _parse_log_lines(f)
+    except FileNotFoundError:
+        current = []
+
+    # A crash after the replace but before the rename leaves the legacy check-ins
+    # already at the head of the log; don't add them twice
+    sessions = current if current[:len(legacy)] == legacy else legacy + current
+    fast_json.write_lines_atomic(WELLNESS_LOG, sessions)
+    LEGACY_WELLNESS_LOG.rename(LEGACY_WELLNESS_LOG.with_name(LEGACY_WELLNESS_LOG.name + ".migrated"))
+    logger.info(f"Migrated {len(legacy)} sessions to {WELLNESS_LOG.name}")
+
+
+class WellnessCompanion(Agent):
+    def __init__(self, room: rtc.Room) -> None:
+        # Load history before setting instructions so we can personalize the greeting
+        self.history = self._load_history()
+
+        # Generate personalized instructions based on history
+        instructions = self._generate_instructions()
+
+        super().__init__(instructions=instructions)
+        self.room = room
+
+        # Initialize current session state
+        self.current_session = {
+            "date": datetime.now().isoformat(),
+            "mood": None,
+            "energy": None,
+            "stressors": [],
+            "goals": [],
+            "summary": None,
+        }
+
+    def _load_history(self) -> list:
+        """Load past check-ins from the JSON Lines log."""
+        try:
+            _migrate_legacy_log()
+            with open(WELLNESS_LOG) as f:
+                stat = os.fstat(f.fileno())
+                key = (stat.st_mtime_ns, stat.st_size)
+                history = _HISTORY_CACHE.get(key)
+                if history is None:
+                    history = _parse_log_lines(f)
+                    _HISTORY_CACHE.clear()
+                    _HISTORY_CACHE[key] = history
+            # Hand out a copy since save_log appends to the agent's history
+            return list(history)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.error(f"Error loading history: {e}")
+            return []
+
+    def _generate_instructions(self) -> str:
+        """Generate personalized instructions based on history."""
+        if not self.history:
+            return BASE_INSTRUCTIONS
+
+        # Add context from last session
+        last_session = self.history[-1]
+        mood = last_session.get("mood")
+        energy = last_session.get("energy")
+        goals = last_session.get("goals")
 
-        return base_instructions
+        parts = [BASE_INSTRUCTIONS, f"\n\nContext from last check-in ({last_session.get('date', 'recent')}):\n"]
+        if mood:
+            parts.append(f"- Mood: {mood}\n")
+        if energy:
+            parts.append(f"- Energy: {energy}\n")
+        if goals:
+            parts.append(f"- Goals: {', '.join(goals)}\n")
+
+        return "".join(parts)
 
     @function_tool
     async def save_log(
@@ -166,7 +236,7 @@ Don't use complex formatting, emojis, or asterisks."""
                 "date": datetime.now().isoformat(),
                 "mood": mood,
                 "energy": energy,
-                "stressors": stressors.split(",") if stressors else [],
+                "stressors": [s for s in STRESSOR_SEPARATOR.split(stressors.strip()) if s] if stressors else [],
                 "goals": goals,
                 "summary": summary,
             }
@@ -175,10 +245,11 @@ Don't use complex formatting, emojis, or asterisks."""
         # Append to history
         self.history.append(self.current_session)
 
-        # Save to file
+        # Append this session to the log
         try:
-            with open(WELLNESS_LOG, "w") as f:
-                json.dump(self.history, f, indent=2)
+            with open(WELLNESS_LOG, "a") as f:
+                f.write(fast_json.dumps(self.current_session) + "\n")
+            _HISTORY_CACHE.clear()
             logger.info(f"Saved wellness log: {len(self.history)} total sessions")
             return "Session saved! Take care, and I'll check in with you next time."
         except Exception as e:
@@ -200,22 +271,31 @@ Don't use complex formatting, emojis, or asterisks."""
         Returns:
             A natural language summary of mood trends
         """
+        no_history = "I don't have enough recent check-ins to analyze your mood trend. Let's do a check-in now to start building that history!"
+        if not self.history:
+            return no_history
+        
         analysis = calculate_mood_trend(self.history, days=days)
         
         if analysis["recent_sessions"] == 0:
-            return "I don't have enough recent check-ins to analyze your mood trend. Let's do a check-in now to start building that history!"
+            return no_history
         
         # Build a conversational response
         response = analysis["trend_summary"]
         
         # Add energy context if available
-        if analysis.get("energies"):
-            high_energy_count = sum(1 for e in analysis["energies"] if e in ["high", "energetic", "good"])
-            low_energy_count = sum(1 for e in analysis["energies"] if e in ["low", "tired", "exhausted"])
+        energies = analysis.get("energies")
+        if energies:
+            high_energy_count = low_energy_count = 0
+            for e in energies:
+                if e in HIGH_ENERGY:
+                    high_energy_count += 1
+                elif e in LOW_ENERGY:
+                    low_energy_count += 1
             
-            if high_energy_count > len(analysis["energies"]) // 2:
+            if high_energy_count > len(energies) // 2:
                 response += " Your energy levels have been pretty good too."
-            elif low_energy_count > len(analysis["energies"]) // 2:
+            elif low_energy_count > len(energies) // 2:
                 response += " Your energy has been on the lower side - make sure you're getting enough rest."
         
         return response
@@ -235,10 +315,14 @@ Don't use complex formatting, emojis, or asterisks."""
         Returns:
             A natural language summary of goal patterns
         """
+        no_goals = "You haven't set specific goals in recent check-ins. Would you like to set some today?"
+        if not self.history:
+            return no_goals
+        
         analysis = calculate_goal_completion_rate(self.history, days=days)
         
         if analysis["total_goals_set"] == 0:
-            return "You haven't set specific goals in recent check-ins. Would you like to set some today?"
+            return no_goals
         
         return analysis["summary"]
 
@@ -254,6 +338,9 @@ Don't use complex formatting, emojis, or asterisks."""
         Returns:
             A comprehensive natural language summary of the week
         """
+        if not self.history:
+            return "I don't have any recent check-ins to summarize. Let's do one now!"
+        
         summary = generate_weekly_insights(self.history)
         return summary
 
@@ -367,6 +454,7 @@ async def entrypoint(ctx: JobContext):
         logger.info(f"Usage: {summary}")
 
     ctx.add_shutdown_callback(log_usage)
+    ctx.add_shutdown_callback(close_mcp_sessions)
 
     # Start the session
     await session.start(
@@ -29,6 +29,36 @@ logger = logging.getLogger("day4_agent")
 
 load_dotenv(".env.local")
 
+# Mode-specific behavior appended to the coach instructions on a mode switch
+MODE_BEHAVIORS = {
+    "learn": """
+            - Explain the current concept clearly.
+            - Use the summary and key points from the content.
+            - Ask if the user understands or wants to move to quiz/teach-back.
+            """,
+    "quiz": """
+            - Ask the sample question for the current concept.
+            - Wait for the user's answer.
+            - Evaluate if they are correct based on the concept summary.
+            """,
+    "teach_back": """
+            - Ask the user to explain the current concept to you.
+            - Listen carefully.
+            - Give feedback on what they missed or explained well.
+            """,
+}
+
+# Full instructions per mode, built once; switch_mode only fills in the concept title
+MODE_INSTRUCTIONS = {
+    mode: f"""You are an Active Recall Coach in {mode.upper()} mode.
+        
+        Current Concept: {{concept}}
+        
+        Behavior for {mode.upper()} mode:
+        """ + behavior
+    for mode, behavior in MODE_BEHAVIORS.items()
+}
+
 class TutorAgent(Agent):
     def __init__(self, room: rtc.Room, tts: murf.TTS) -> None:
         super().__init__(
@@ -87,32 +117,9 @@ class TutorAgent(Agent):
             logger.warning("Could not update TTS voice: 'voice' attribute not found")
 
         # Update instructions context
-        self.instructions = f"""You are an Active Recall Coach in {mode.upper()} mode.
-        
-        Current Concept: {self.current_concept.get('title') if self.current_concept else 'None selected'}
-        
-        Behavior for {mode.upper()} mode:
-        """
+        title = self.current_concept.get('title') if self.current_concept else 'None selected'
+        self.instructions = MODE_INSTRUCTIONS[mode].format(concept=title)
         
-        if mode == "learn":
-            self.instructions += """
-            - Explain the current concept clearly.
-            - Use the summary and key points from the content.
-            - Ask if the user understands or wants to move to quiz/teach-back.
-            """
-        elif mode == "quiz":
-            self.instructions += """
-            - Ask the sample question for the current concept.
-            - Wait for the user's answer.
-            - Evaluate if they are correct based on the concept summary.
-            """
-        elif mode == "teach_back":
-            self.instructions += """
-            - Ask the user to explain the current concept to you.
-            - Listen carefully.
-            - Give feedback on what they missed or explained well.
-            """
-            
         return f"Switched to {mode} mode. I am now ready."
 
     @function_tool
@@ -1,6 +1,9 @@
+import asyncio
 import logging
-import json
+import math
+import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated, Optional
 
@@ -20,9 +23,12 @@ from livekit.agents import (
     metrics,
     tokenize,
 )
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
+from livekit.plugins import murf, google, deepgram, noise_cancellation
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
+import fast_json
+from voice_models import load_vad
+
 logger = logging.getLogger("day5_agent")
 
 load_dotenv(".env.local")
@@ -31,13 +37,23 @@ load_dotenv(".env.local")
 CONTENT_FILE = Path(__file__).parent.parent / "shared-data" / "day5_sdr_content.json"
 LEADS_DIR = Path(__file__).parent.parent / "leads"
 LEADS_DIR.mkdir(exist_ok=True)
+# Plain-string form for building lead file paths without pathlib overhead
+LEADS_DIR_STR = str(LEADS_DIR)
 
-class SDRAgent(Agent):
-    def __init__(self, room: rtc.Room) -> None:
-        self.content = self._load_content()
-        
-        super().__init__(
-            instructions=f"""You are Riya, a Sales Development Representative (SDR) for Razorpay, India's leading payments company.
+
+@lru_cache(maxsize=1)
+def get_content() -> dict:
+    """Load the SDR knowledge base once per process; it is shared by every session."""
+    try:
+        with open(CONTENT_FILE, "rb") as f:
+            return fast_json.loads(f.read())
+    except Exception as e:
+        logger.error("Failed to load content: %s", e)
+        return {"company": {}, "products": [], "pricing": {}, "faqs": []}
+
+
+# SDR prompt; the knowledge base sections are filled in by get_instructions
+INSTRUCTIONS_TEMPLATE = """You are Riya, a Sales Development Representative (SDR) for Razorpay, India's leading payments company.
             
             Your goal is to:
             1. Qualify the lead by gathering key information.
@@ -45,16 +61,16 @@ class SDRAgent(Agent):
             3. Be friendly, professional, and helpful.
             
             **Company Info**:
-            {json.dumps(self.content['company'])}
+            {company}
             
             **Products**:
-            {json.dumps(self.content['products'])}
+            {products}
             
             **Pricing**:
-            {json.dumps(self.content['pricing'])}
+            {pricing}
             
             **FAQs**:
-            {json.dumps(self.content['faqs'])}
+            {faqs}
             
             **Lead Qualification Fields to Collect**:
             - Name
@@ -74,7 +90,90 @@ class SDRAgent(Agent):
             **Important**:
             - Always update the lead details using `update_lead_info` as you learn new things.
             - If the user says "I'm done", "That's all", or "Thanks", initiate the closing sequence and call `finalize_call`.
-            """,
+            """
+
+
+@lru_cache(maxsize=1)
+def get_instructions() -> str:
+    """Render the SDR instructions once per process from the cached knowledge base."""
+    content = get_content()
+    return INSTRUCTIONS_TEMPLATE.format(
+        company=fast_json.dumps(content['company']),
+        products=fast_json.dumps(content['products']),
+        pricing=fast_json.dumps(content['pricing']),
+        faqs=fast_json.dumps(content['faqs']),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_pricing_text() -> str:
+    """Serialize the pricing section once per process for get_pricing_info."""
+    return fast_json.dumps(get_content()['pricing'])
+
+
+@lru_cache(maxsize=1)
+def get_faq_index() -> list[tuple[str, str, str]]:
+    """Lowercased question, lowercased answer and rendered Q/A text for each FAQ."""
+    return [
+        (faq['question'].lower(), faq['answer'].lower(), f"Q: {faq['question']}\nA: {faq['answer']}")
+        for faq in get_content()['faqs']
+    ]
+
+
+# Words ignored when ranking FAQs by similarity to a query
+FAQ_STOPWORDS = frozenset((
+    "a", "an", "and", "are", "can", "do", "does", "for", "from", "how", "i", "if",
+    "in", "is", "it", "me", "my", "of", "on", "or", "the", "to", "what", "when",
+    "where", "which", "who", "will", "with", "you", "your",
+))
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# Most FAQ entries returned when no entry contains the query verbatim
+FAQ_SIMILAR_LIMIT = 2
+
+
+def _faq_terms(text: str) -> frozenset[str]:
+    return frozenset(w for w in WORD_PATTERN.findall(text.lower()) if w not in FAQ_STOPWORDS)
+
+
+@lru_cache(maxsize=1)
+def get_faq_terms() -> list[frozenset[str]]:
+    """Content words of each FAQ question and answer, used for similarity ranking."""
+    return [_faq_terms(f"{faq['question']} {faq['answer']}") for faq in get_content()['faqs']]
+
+
+def find_similar_faqs(query: str) -> list[str]:
+    """Rank FAQs by cosine similarity of their content words to the query.
+
+    Returns:
+        Rendered Q/A text of the best matches, most similar first
+    """
+    query_terms = _faq_terms(query)
+    if not query_terms:
+        return []
+    
+    scored = []
+    for i, terms in enumerate(get_faq_terms()):
+        shared = len(query_terms & terms)
+        if shared:
+            scored.append((shared / math.sqrt(len(query_terms) * len(terms)), i))
+    scored.sort(reverse=True)
+    
+    faq_index = get_faq_index()
+    return [faq_index[i][2] for _, i in scored[:FAQ_SIMILAR_LIMIT]]
+
+
+def _write_lead_file(filepath: str, lead: dict) -> None:
+    """Write a finalized lead to disk."""
+    with open(filepath, 'w') as f:
+        f.write(fast_json.dumps(lead))
+
+
+class SDRAgent(Agent):
+    def __init__(self, room: rtc.Room) -> None:
+        self.content = get_content()
+        
+        super().__init__(
+            instructions=get_instructions(),
         )
         self.room = room
         self.lead_data = {
@@ -88,14 +187,6 @@ class SDRAgent(Agent):
             "notes": []
         }
 
-    def _load_content(self) -> dict:
-        try:
-            with open(CONTENT_FILE) as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Failed to load content: {e}")
-            return {"company": {}, "products": [], "pricing": {}, "faqs": []}
-
     @function_tool
     async def update_lead_info(
         self, 
@@ -111,38 +202,28 @@ class SDRAgent(Agent):
         """Update the lead's information as you gather it during the conversation.
         Call this tool whenever the user provides new details.
         """
-        updates = []
-        if name:
-            self.lead_data["name"] = name
-            updates.append(f"name: {name}")
-        if company:
-            self.lead_data["company"] = company
-            updates.append(f"company: {company}")
-        if role:
-            self.lead_data["role"] = role
-            updates.append(f"role: {role}")
-        if use_case:
-            self.lead_data["use_case"] = use_case
-            updates.append(f"use_case: {use_case}")
-        if team_size:
-            self.lead_data["team_size"] = team_size
-            updates.append(f"team_size: {team_size}")
-        if timeline:
-            self.lead_data["timeline"] = timeline
-            updates.append(f"timeline: {timeline}")
-        if email:
-            self.lead_data["email"] = email
-            updates.append(f"email: {email}")
-            
-        if updates:
-            logger.info(f"Updated lead info: {', '.join(updates)}")
-            return f"Updated: {', '.join(updates)}"
-        return "No updates provided."
+        fields = {
+            "name": name,
+            "company": company,
+            "role": role,
+            "use_case": use_case,
+            "team_size": team_size,
+            "timeline": timeline,
+            "email": email,
+        }
+        provided = {field: value for field, value in fields.items() if value}
+        if not provided:
+            return "No updates provided."
+        
+        self.lead_data.update(provided)
+        updates = ", ".join(f"{field}: {value}" for field, value in provided.items())
+        logger.info("Updated lead info: %s", updates)
+        return f"Updated: {updates}"
 
     @function_tool
     async def get_pricing_info(self, context: RunContext):
         """Get detailed pricing information for Razorpay products."""
-        return json.dumps(self.content['pricing'])
+        return get_pricing_text()
 
     @function_tool
     async def lookup_faq(self, context: RunContext, query: str):
@@ -153,14 +234,20 @@ class SDRAgent(Agent):
         """
         # Simple keyword search
         query_lower = query.lower()
-        matches = []
-        for faq in self.content['faqs']:
-            if query_lower in faq['question'].lower() or query_lower in faq['answer'].lower():
-                matches.append(f"Q: {faq['question']}\nA: {faq['answer']}")
+        matches = [
+            rendered
+            for question_lower, answer_lower, rendered in get_faq_index()
+            if query_lower in question_lower or query_lower in answer_lower
+        ]
         
         if matches:
             return "\n\n".join(matches)
         
+        # Fall back to the closest entries for paraphrased questions
+        similar = find_similar_faqs(query)
+        if similar:
+            return "No exact match, but these FAQ entries look related:\n\n" + "\n\n".join(similar)
+        
         return "I couldn't find a specific FAQ entry for that. Please answer based on general knowledge or offer to connect them with support."
 
     @function_tool
@@ -168,23 +255,23 @@ class SDRAgent(Agent):
         """End the call, save the lead data, and provide a verbal summary.
         Call this when the user indicates they are done or you have collected all necessary information.
         """
-        # Save to JSON
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"lead_{timestamp}_{self.lead_data['name'] or 'unknown'}.json"
-        filepath = LEADS_DIR / filename
+        # Save to JSON; one clock read keeps the filename and record timestamp in step
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        filepath = f"{LEADS_DIR_STR}/lead_{timestamp}_{self.lead_data['name'] or 'unknown'}.json"
         
         final_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "lead_details": self.lead_data,
             "status": "qualified" if self.lead_data['email'] else "partial"
         }
         
         try:
-            with open(filepath, 'w') as f:
-                json.dump(final_data, f, indent=2)
-            logger.info(f"Lead saved to {filepath}")
+            # Write in a worker thread so the event loop keeps serving audio
+            await asyncio.to_thread(_write_lead_file, filepath, final_data)
+            logger.info("Lead saved to %s", filepath)
         except Exception as e:
-            logger.error(f"Failed to save lead: {e}")
+            logger.error("Failed to save lead: %s", e)
             return "I encountered an error saving the lead details."
 
         # Generate summary for the user
@@ -213,7 +300,18 @@ class SDRAgent(Agent):
         return summary
 
 def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["vad"] = load_vad()
+    # Read and render the knowledge base before a call is assigned
+    get_instructions()
+    # Build the speech and LLM clients while the process is idle, before a call is assigned
+    proc.userdata["stt"] = deepgram.STT(model="nova-3")
+    proc.userdata["llm"] = google.LLM(model="gemini-2.5-flash")
+    proc.userdata["tts"] = murf.TTS(
+        voice="en-US-terra", # Professional female voice suitable for SDR
+        style="Promo",
+        tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
+        text_pacing=True,
+    )
 
 async def entrypoint(ctx: JobContext):
     # Logging setup
@@ -223,14 +321,9 @@ async def entrypoint(ctx: JobContext):
 
     # Set up voice AI pipeline
     session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-terra", # Professional female voice suitable for SDR
-            style="Promo",
-            tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
-            text_pacing=True,
-        ),
+        stt=ctx.proc.userdata["stt"],
+        llm=ctx.proc.userdata["llm"],
+        tts=ctx.proc.userdata["tts"],
         turn_detection=MultilingualModel(),
         vad=ctx.proc.userdata["vad"],
         preemptive_generation=True,
@@ -246,7 +339,7 @@ async def entrypoint(ctx: JobContext):
 
     async def log_usage():
         summary = usage_collector.get_summary()
-        logger.info(f"Usage: {summary}")
+        logger.info("Usage: %s", summary)
 
     ctx.add_shutdown_callback(log_usage)
 
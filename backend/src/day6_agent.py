@@ -1,5 +1,5 @@
+import asyncio
 import logging
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -20,9 +20,12 @@ from livekit.agents import (
     metrics,
     tokenize,
 )
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
+from livekit.plugins import murf, google, deepgram, noise_cancellation
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
+import fast_json
+from voice_models import load_vad
+
 logger = logging.getLogger("day6_agent")
 
 load_dotenv(".env.local")
@@ -30,6 +33,32 @@ load_dotenv(".env.local")
 # Paths
 FRAUD_CASES_FILE = Path(__file__).parent.parent / "fraud_cases.json"
 
+# Tools offered to the LLM at each stage of the call, keeping every request's tool schema small
+STAGE_TOOLS = {
+    "intro": ("load_fraud_case", "end_call"),
+    "loaded": ("load_fraud_case", "verify_customer", "end_call"),
+    "verified": (
+        "get_transaction_details",
+        "mark_transaction_safe",
+        "mark_transaction_fraudulent",
+        "end_call",
+    ),
+}
+
+# Parsed fraud cases shared across calls, invalidated when the file's mtime changes.
+# "positions" maps case ID to list index and "by_username" maps lowercase names to cases.
+_cases_cache = {"mtime": None, "data": None, "positions": {}, "by_username": {}}
+
+
+def _cache_cases(mtime, cases):
+    """Store parsed cases and build their ID and username lookups (first match wins)."""
+    positions = {}
+    by_username = {}
+    for i, case in enumerate(cases):
+        positions.setdefault(case.get("id"), i)
+        by_username.setdefault(case.get("userName", "").lower(), case)
+    _cases_cache.update(mtime=mtime, data=cases, positions=positions, by_username=by_username)
+
 
 class FraudAlertAgent(Agent):
     def __init__(self, room: rtc.Room) -> None:
@@ -73,31 +102,71 @@ class FraudAlertAgent(Agent):
         self.fraud_case = None
         self.is_verified = False
         self.call_completed = False
+        # Set when the loaded case has changes that flush_case has not written yet
+        self._dirty = False
+        self.stage = None
+        self._tools_by_name = {tool.id: tool for tool in self.tools}
+
+    async def on_enter(self):
+        """Start the call with only the case lookup tools."""
+        await self._enter_stage("intro")
+
+    async def _enter_stage(self, stage):
+        """Expose only the tools relevant to the given call stage."""
+        if stage == self.stage:
+            return
+        self.stage = stage
+        await self.update_tools([self._tools_by_name[name] for name in STAGE_TOOLS[stage]])
 
     def _load_all_cases(self):
-        """Load all fraud cases from the database."""
+        """Load all fraud cases from the database, reusing the parsed copy while the file is unchanged."""
         try:
             if not FRAUD_CASES_FILE.exists():
-                logger.error(f"Fraud cases file not found: {FRAUD_CASES_FILE}")
+                logger.error("Fraud cases file not found: %s", FRAUD_CASES_FILE)
                 return []
             
-            with open(FRAUD_CASES_FILE, "r") as f:
-                cases = json.load(f)
+            mtime = FRAUD_CASES_FILE.stat().st_mtime_ns
+            if _cases_cache["mtime"] == mtime:
+                return _cases_cache["data"]
             
-            logger.info(f"Loaded {len(cases)} fraud cases from database")
+            with open(FRAUD_CASES_FILE, "rb") as f:
+                cases = fast_json.loads(f.read())
+            
+            _cache_cases(mtime, cases)
+            logger.info("Loaded %s fraud cases from database", len(cases))
             return cases
         except Exception as e:
-            logger.error(f"Error loading fraud cases: {e}")
+            logger.error("Error loading fraud cases: %s", e)
             return []
 
     def _save_all_cases(self, cases):
         """Save all fraud cases back to the database."""
         try:
-            with open(FRAUD_CASES_FILE, "w") as f:
-                json.dump(cases, f, indent=2)
-            logger.info(f"Saved {len(cases)} fraud cases to database")
+            # Atomic replace: readers in other workers never see a half-written file
+            fast_json.write_atomic(FRAUD_CASES_FILE, cases)
+            _cache_cases(FRAUD_CASES_FILE.stat().st_mtime_ns, cases)
+            logger.info("Saved %s fraud cases to database", len(cases))
         except Exception as e:
-            logger.error(f"Error saving fraud cases: {e}")
+            # The cached cases may hold edits that never reached disk; reload next time
+            _cases_cache["mtime"] = None
+            logger.error("Error saving fraud cases: %s", e)
+
+    def _store_fraud_case(self):
+        """Write the current fraud case back into the database."""
+        all_cases = self._load_all_cases()
+        if all_cases is _cases_cache["data"]:
+            position = _cases_cache["positions"].get(self.fraud_case.get("id"))
+            if position is not None:
+                all_cases[position] = self.fraud_case
+        
+        self._save_all_cases(all_cases)
+
+    async def flush_case(self):
+        """Write pending fraud case changes to the database, if there are any."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        await asyncio.to_thread(self._store_fraud_case)
 
     @function_tool
     async def load_fraud_case(
@@ -110,14 +179,13 @@ class FraudAlertAgent(Agent):
         Args:
             username: The customer's name to look up their fraud case.
         """
-        all_cases = self._load_all_cases()
+        # File I/O runs in a worker thread so the event loop keeps serving audio
+        all_cases = await asyncio.to_thread(self._load_all_cases)
         
         # Find matching case (case-insensitive)
         matching_case = None
-        for case in all_cases:
-            if case.get("userName", "").lower() == username.lower():
-                matching_case = case
-                break
+        if all_cases is _cases_cache["data"]:
+            matching_case = _cases_cache["by_username"].get(username.lower())
         
         if not matching_case:
             return f"I couldn't find a fraud case for '{username}'. Please verify the name."
@@ -126,7 +194,8 @@ class FraudAlertAgent(Agent):
             return f"This fraud case has already been processed. Status: {matching_case.get('status')}"
         
         self.fraud_case = matching_case
-        logger.info(f"Loaded fraud case for {username}: Case ID {self.fraud_case.get('id')}")
+        logger.info("Loaded fraud case for %s: Case ID %s", username, self.fraud_case.get('id'))
+        await self._enter_stage("loaded")
         
         return f"Fraud case loaded for {self.fraud_case['userName']}. Transaction of ${self.fraud_case['transactionAmount']} at {self.fraud_case['transactionName']}."
 
@@ -150,10 +219,11 @@ class FraudAlertAgent(Agent):
         # Check if the security identifier matches
         if security_identifier == self.fraud_case.get("securityIdentifier"):
             self.is_verified = True
-            logger.info(f"Customer {self.fraud_case['userName']} verified successfully")
+            logger.info("Customer %s verified successfully", self.fraud_case['userName'])
+            await self._enter_stage("verified")
             return "Identity verified successfully. I can now proceed with the fraud investigation."
         else:
-            logger.warning(f"Verification failed for {self.fraud_case['userName']}")
+            logger.warning("Verification failed for %s", self.fraud_case['userName'])
             return "I'm sorry, but the security identifier you provided doesn't match our records. For security reasons, I cannot proceed with this call. Please contact our customer service directly."
 
     @function_tool
@@ -199,17 +269,12 @@ class FraudAlertAgent(Agent):
         self.fraud_case["status"] = "confirmed_safe"
         self.fraud_case["outcomeNote"] = f"Customer confirmed transaction as legitimate on {datetime.now().isoformat()}"
         
-        # Save to database
-        all_cases = self._load_all_cases()
-        for i, case in enumerate(all_cases):
-            if case.get("id") == self.fraud_case.get("id"):
-                all_cases[i] = self.fraud_case
-                break
-        
-        self._save_all_cases(all_cases)
+        # Save the outcome right away so it survives a dropped call
+        self._dirty = True
         self.call_completed = True
+        await self.flush_case()
         
-        logger.info(f"Transaction marked as SAFE for case ID {self.fraud_case['id']}")
+        logger.info("Transaction marked as SAFE for case ID %s", self.fraud_case['id'])
         
         return f"""
         Thank you for confirming. I've marked this transaction as legitimate in our system.
@@ -233,17 +298,12 @@ class FraudAlertAgent(Agent):
         self.fraud_case["status"] = "confirmed_fraud"
         self.fraud_case["outcomeNote"] = f"Customer denied transaction. Card blocked and dispute initiated on {datetime.now().isoformat()}"
         
-        # Save to database
-        all_cases = self._load_all_cases()
-        for i, case in enumerate(all_cases):
-            if case.get("id") == self.fraud_case.get("id"):
-                all_cases[i] = self.fraud_case
-                break
-        
-        self._save_all_cases(all_cases)
+        # Save the outcome right away so it survives a dropped call
+        self._dirty = True
         self.call_completed = True
+        await self.flush_case()
         
-        logger.info(f"Transaction marked as FRAUDULENT for case ID {self.fraud_case['id']}")
+        logger.info("Transaction marked as FRAUDULENT for case ID %s", self.fraud_case['id'])
         
         return f"""
         I understand. For your protection, I have immediately:
@@ -265,21 +325,24 @@ class FraudAlertAgent(Agent):
             # Mark as verification failed if we didn't complete
             self.fraud_case["status"] = "verification_failed"
             self.fraud_case["outcomeNote"] = f"Call ended without resolution on {datetime.now().isoformat()}"
-            
-            all_cases = self._load_all_cases()
-            for i, case in enumerate(all_cases):
-                if case.get("id") == self.fraud_case.get("id"):
-                    all_cases[i] = self.fraud_case
-                    break
-            
-            self._save_all_cases(all_cases)
-            logger.info(f"Call ended without resolution for case ID {self.fraud_case['id']}")
+            self._dirty = True
+            logger.info("Call ended without resolution for case ID %s", self.fraud_case['id'])
         
+        await self.flush_case()
         return "Thank you for your time. Goodbye!"
 
 
 def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["vad"] = load_vad()
+    # Build the speech and LLM clients while the process is idle, before a call is assigned
+    proc.userdata["stt"] = deepgram.STT(model="nova-3")
+    proc.userdata["llm"] = google.LLM(model="gemini-2.5-flash")
+    proc.userdata["tts"] = murf.TTS(
+        voice="en-US-matthew-falcon",
+        style="Conversation",
+        tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
+        text_pacing=True,
+    )
 
 
 async def entrypoint(ctx: JobContext):
@@ -288,19 +351,11 @@ async def entrypoint(ctx: JobContext):
         "room": ctx.room.name,
     }
 
-    # Initialize TTS
-    murf_tts = murf.TTS(
-        voice="en-US-matthew-falcon",
-        style="Conversation",
-        tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
-        text_pacing=True,
-    )
-
     # Set up voice AI pipeline
     session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf_tts,
+        stt=ctx.proc.userdata["stt"],
+        llm=ctx.proc.userdata["llm"],
+        tts=ctx.proc.userdata["tts"],
         turn_detection=MultilingualModel(),
         vad=ctx.proc.userdata["vad"],
         preemptive_generation=True,
@@ -316,12 +371,17 @@ async def entrypoint(ctx: JobContext):
 
     async def log_usage():
         summary = usage_collector.get_summary()
-        logger.info(f"Usage: {summary}")
+        logger.info("Usage: %s", summary)
 
     ctx.add_shutdown_callback(log_usage)
 
     # Start the session
     agent = FraudAlertAgent(room=ctx.room)
+    # Persist case changes even if the caller hangs up before end_call
+    ctx.add_shutdown_callback(agent.flush_case)
+    # Parse the case database in a worker thread while the session starts and connects,
+    # so the first load_fraud_case call hits the cache
+    cases_task = asyncio.create_task(asyncio.to_thread(agent._load_all_cases))
     
     await session.start(
         agent=agent,
@@ -333,6 +393,7 @@ async def entrypoint(ctx: JobContext):
 
     # Join the room and connect to the user
     await ctx.connect()
+    await cases_task
 
 
 if __name__ == "__main__":
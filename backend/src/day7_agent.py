@@ -1,9 +1,11 @@
+import asyncio
 import logging
-import json
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Dict
 import uuid
+from collections import OrderedDict
 
 from dotenv import load_dotenv
 from livekit import rtc
@@ -24,6 +26,8 @@ from livekit.agents import (
 from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
+import fast_json
+
 logger = logging.getLogger("day7_agent")
 
 load_dotenv(".env.local")
@@ -31,10 +35,141 @@ load_dotenv(".env.local")
 # Paths
 CATALOG_FILE = Path(__file__).parent.parent / "catalog.json"
 ORDER_HISTORY_FILE = Path(__file__).parent.parent / "order_history.json"
+# Older orders, one JSON object per line, moved out of order_history.json
+ORDER_ARCHIVE_FILE = Path(__file__).parent.parent / "order_history_archive.jsonl"
+
+# Orders kept in order_history.json; older ones are appended to the archive
+MAX_RECENT_ORDERS = 500
+
+# Seconds between background writes of pending order history changes
+HISTORY_FLUSH_INTERVAL = 5.0
+
+# Order timestamps never change, and track_order re-reads them on every call,
+# so parsed timestamps are memoized
+_parse_timestamp = lru_cache(maxsize=1024)(datetime.fromisoformat)
+
+# Order statuses in delivery order, and each status's position in it
+STATUS_PROGRESSION = ("received", "confirmed", "being_prepared", "out_for_delivery", "delivered")
+STATUS_INDEX = {status: i for i, status in enumerate(STATUS_PROGRESSION)}
+
+STATUS_EMOJI = {
+    "received": "📦",
+    "confirmed": "✅",
+    "being_prepared": "👨‍🍳",
+    "out_for_delivery": "🚚",
+    "delivered": "🎉"
+}
+
+# Distinct search terms whose matches each agent remembers
+SEARCH_CACHE_MAX = 128
+
+
+def _to_cents(price: float) -> int:
+    """Convert a dollar price to whole cents."""
+    return round(price * 100)
+
+
+def _catalog_mtime() -> Optional[int]:
+    """Return the catalog file's modification time, used to key the catalog cache."""
+    try:
+        return CATALOG_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _load_catalog_bundle(mtime_ns: Optional[int]) -> Dict:
+    """Parse the catalog and build its lookup indexes, once per catalog file version.
+
+    The catalog is read-only at runtime, so every agent in the process shares
+    the returned lists and dicts.
+    """
+    bundle = {
+        "catalog": [],
+        "by_id": {},
+        "by_name_lower": {},
+        # (name, category, subcategory, tags, item) per item, lowercased for search
+        "search_index": [],
+    }
+    try:
+        if mtime_ns is None:
+            logger.error(f"Catalog file not found: {CATALOG_FILE}")
+            return bundle
+        
+        with open(CATALOG_FILE, "rb") as f:
+            catalog = fast_json.loads(f.read())
+        
+        by_id = bundle["by_id"]
+        by_name_lower = bundle["by_name_lower"]
+        search_index = bundle["search_index"]
+        # The first item wins on duplicate IDs or names, as with a linear scan
+        for item in catalog:
+            item["_tags_set"] = frozenset(tag.lower() for tag in item.get("tags", []))
+            name_lower = item["name"].lower()
+            by_id.setdefault(item["id"], item)
+            by_name_lower.setdefault(name_lower, item)
+            entry = (
+                name_lower,
+                item["category"].lower(),
+                item.get("subcategory", "").lower(),
+                tuple(tag.lower() for tag in item.get("tags", [])),
+                item,
+            )
+            search_index.append(entry)
+        
+        bundle["catalog"] = catalog
+        logger.info(f"Loaded {len(catalog)} items from catalog")
+    except Exception as e:
+        logger.error(f"Error loading catalog: {e}")
+    return bundle
+
+
+def _read_order_history() -> Dict:
+    """Read order history from JSON, creating an empty history file if there is none."""
+    try:
+        if not ORDER_HISTORY_FILE.exists():
+            # Create empty history
+            history = {"orders": [], "recipes": {}}
+            with open(ORDER_HISTORY_FILE, "w") as f:
+                f.write(fast_json.dumps(history, indent=True))
+            return history
+        
+        with open(ORDER_HISTORY_FILE, "rb") as f:
+            history = fast_json.loads(f.read())
+        
+        logger.info(f"Loaded {len(history.get('orders', []))} orders from history")
+        return history
+    except Exception as e:
+        logger.error(f"Error loading order history: {e}")
+        return {"orders": [], "recipes": {}}
+
+
+def _append_archived_orders(orders: List[Dict]):
+    """Append orders to the archive file, one JSON document per line."""
+    with open(ORDER_ARCHIVE_FILE, "a") as f:
+        f.write("".join(fast_json.dumps(order) + "\n" for order in orders))
+
+
+def _find_archived_order(order_id: str) -> Optional[Dict]:
+    """Scan the archive for an order ID, returning the most recently archived match."""
+    found = None
+    try:
+        with open(ORDER_ARCHIVE_FILE, "rb") as f:
+            for line in f:
+                # Cheap substring test before parsing the line
+                if order_id.encode() in line:
+                    order = fast_json.loads(line)
+                    if order.get("id") == order_id:
+                        found = order
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Error reading order archive: {e}")
+    return found
 
 
 class FoodGroceryAgent(Agent):
-    def __init__(self, room: rtc.Room) -> None:
+    def __init__(self, room: rtc.Room, catalog_bundle: Optional[Dict] = None) -> None:
         super().__init__(
             instructions="""You are a friendly food and grocery ordering assistant for FreshMart, a premier food delivery service.
             
@@ -82,96 +217,221 @@ class FoodGroceryAgent(Agent):
             """,
         )
         self.room = room
-        self.cart: List[Dict] = []
+        # Also builds _cart_by_id, the cart entries by item ID
+        self.cart = []
         self.catalog: List[Dict] = []
-        self.order_history: Dict = {}
-        self.budget: Optional[float] = None
-        self.dietary_restrictions: List[str] = []
-        
-        # Load catalog and order history
-        self._load_catalog()
-        self._load_order_history()
-
-    def _load_catalog(self):
-        """Load the product catalog from JSON."""
-        try:
-            if not CATALOG_FILE.exists():
-                logger.error(f"Catalog file not found: {CATALOG_FILE}")
-                return
-            
-            with open(CATALOG_FILE, "r") as f:
-                self.catalog = json.load(f)
-            
-            logger.info(f"Loaded {len(self.catalog)} items from catalog")
-        except Exception as e:
-            logger.error(f"Error loading catalog: {e}")
+        # Loaded from disk on first access to order_history
+        self._order_history: Optional[Dict] = None
+        # Lowercase recipe name -> (recipe name, item IDs), built on first recipe lookup
+        # and reset whenever order_history is assigned
+        self._recipe_index: Optional[Dict[str, tuple]] = None
+        # Also sets _budget_cents, the budget in whole cents
+        self.budget = None
+        self.dietary_restrictions = []
+        # Order history changes not yet written by flush_order_history
+        self._history_dirty = False
+        
+        # Lowercased search term -> matching items, least recently used first
+        self._search_cache: OrderedDict[str, List[Dict]] = OrderedDict()
+        
+        # Load catalog unless prewarm already built it; order history waits until a tool needs it
+        self._load_catalog(catalog_bundle)
+
+    @property
+    def cart(self) -> List[Dict]:
+        """Cart entries; assigning a new list re-indexes it by item ID."""
+        return self._cart
+
+    @cart.setter
+    def cart(self, value: List[Dict]):
+        self._cart = value
+        self._cart_by_id: Dict[str, Dict] = {}
+        for cart_item in value:
+            self._cart_by_id.setdefault(cart_item["id"], cart_item)
+
+    @property
+    def budget(self) -> Optional[float]:
+        """Spending limit in dollars, or None when no budget is set."""
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: Optional[float]):
+        self._budget = value
+        self._budget_cents = _to_cents(value) if value else 0
+
+    @property
+    def order_history(self) -> Dict:
+        """Past orders and recipes, loaded on first use."""
+        if self._order_history is None:
+            self._load_order_history()
+        return self._order_history
+
+    @order_history.setter
+    def order_history(self, value: Dict):
+        self._order_history = value
+        # Rebuilt from the new history's recipes on the next lookup
+        self._recipe_index = None
+
+    @property
+    def dietary_restrictions(self) -> List[str]:
+        """Lowercase tags every item added to the cart should carry."""
+        return self._dietary_restrictions
+
+    @dietary_restrictions.setter
+    def dietary_restrictions(self, value: List[str]):
+        self._dietary_restrictions = value
+        # Checked as a subset of each item's tags
+        self._dietary_set = frozenset(value)
+
+    def _load_catalog(self, bundle: Optional[Dict] = None):
+        """Attach the shared product catalog and its lookup indexes."""
+        if bundle is None:
+            bundle = _load_catalog_bundle(_catalog_mtime())
+        self.catalog = bundle["catalog"]
+        self._by_id = bundle["by_id"]
+        self._by_name_lower = bundle["by_name_lower"]
+        self._search_index = bundle["search_index"]
 
     def _load_order_history(self):
         """Load order history from JSON."""
-        try:
-            if not ORDER_HISTORY_FILE.exists():
-                # Create empty history
-                self.order_history = {"orders": [], "recipes": {}}
-                self._save_order_history()
-                return
-            
-            with open(ORDER_HISTORY_FILE, "r") as f:
-                self.order_history = json.load(f)
-            
-            logger.info(f"Loaded {len(self.order_history.get('orders', []))} orders from history")
-        except Exception as e:
-            logger.error(f"Error loading order history: {e}")
-            self.order_history = {"orders": [], "recipes": {}}
+        self.order_history = _read_order_history()
+
+    async def preload_order_history(self):
+        """Read order history in a worker thread, unless a tool has already loaded it."""
+        if self._order_history is not None:
+            return
+        history = await asyncio.to_thread(_read_order_history)
+        # Assigned on the event loop, so history a tool loaded in the meantime is kept
+        if self._order_history is None:
+            self.order_history = history
 
     def _save_order_history(self):
         """Save order history to JSON."""
         try:
             with open(ORDER_HISTORY_FILE, "w") as f:
-                json.dump(self.order_history, f, indent=2)
+                f.write(fast_json.dumps(self.order_history, indent=True))
             logger.info(f"Saved order history with {len(self.order_history.get('orders', []))} orders")
         except Exception as e:
             logger.error(f"Error saving order history: {e}")
 
+    def flush_order_history(self):
+        """Write order history to disk if it has unsaved changes."""
+        if self._history_dirty:
+            self._history_dirty = False
+            self._save_order_history()
+
+    async def autosave_order_history(self):
+        """Flush order history changes every HISTORY_FLUSH_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(HISTORY_FLUSH_INTERVAL)
+            self.flush_order_history()
+
     def _find_item_by_name(self, item_name: str) -> Optional[Dict]:
         """Find an item in the catalog by name (fuzzy matching)."""
         item_name_lower = item_name.lower()
         
         # Try exact match first
-        for item in self.catalog:
-            if item["name"].lower() == item_name_lower:
-                return item
+        item = self._by_name_lower.get(item_name_lower)
+        if item:
+            return item
         
         # Try partial match
-        for item in self.catalog:
-            if item_name_lower in item["name"].lower():
+        for name_lower, _, _, _, item in self._search_index:
+            if item_name_lower in name_lower:
                 return item
         
         return None
 
     def _find_item_by_id(self, item_id: str) -> Optional[Dict]:
         """Find an item in the catalog by ID."""
-        for item in self.catalog:
-            if item["id"] == item_id:
-                return item
+        return self._by_id.get(item_id)
+
+    def _add_cart_entry(self, item: Dict, quantity: int) -> Dict:
+        """Append a new cart entry for a catalog item."""
+        cart_entry = {
+            "id": item["id"],
+            "name": item["name"],
+            "brand": item["brand"],
+            "size": item["size"],
+            "price": item["price"],
+            "quantity": quantity
+        }
+        self.cart.append(cart_entry)
+        self._cart_by_id[cart_entry["id"]] = cart_entry
+        return cart_entry
+
+    def _remove_cart_entry(self, cart_item: Dict):
+        """Remove an entry from the cart."""
+        self.cart.remove(cart_item)
+        self._cart_by_id.pop(cart_item["id"], None)
+
+    def _find_cart_item(self, item_name: str) -> Optional[Dict]:
+        """Find a cart entry by exact catalog name, then by partial name."""
+        item_name_lower = item_name.lower()
+        
+        item = self._by_name_lower.get(item_name_lower)
+        if item and item["id"] in self._cart_by_id:
+            return self._cart_by_id[item["id"]]
+        
+        for cart_item in self.cart:
+            if item_name_lower in cart_item["name"].lower():
+                return cart_item
         return None
 
+    def _cart_total_cents(self) -> int:
+        """Sum the cart in whole cents, so no float rounding is needed."""
+        return sum(_to_cents(cart_item["price"]) * cart_item["quantity"] for cart_item in self.cart)
+
+    def _find_recipe(self, dish_lower: str) -> tuple:
+        """Find a recipe by exact name, then by partial match in either direction.
+
+        Returns:
+            (recipe name, item IDs), or (None, None) when nothing matches
+        """
+        recipes = self.order_history.get("recipes", {})
+        if self._recipe_index is None:
+            self._recipe_index = {name.lower(): (name, item_ids) for name, item_ids in recipes.items()}
+        
+        exact = self._recipe_index.get(dish_lower)
+        if exact:
+            return exact
+        
+        for recipe_name, item_ids in recipes.items():
+            if dish_lower in recipe_name or recipe_name in dish_lower:
+                return recipe_name, item_ids
+        return None, None
+
+    def _search_matches(self, search_lower: str) -> List[Dict]:
+        """Find catalog items whose name, category, subcategory or tags contain the term."""
+        matching_items = self._search_cache.get(search_lower)
+        if matching_items is not None:
+            self._search_cache.move_to_end(search_lower)
+            return matching_items
+        
+        matching_items = []
+        for name_lower, category_lower, subcategory_lower, tags_lower, item in self._search_index:
+            if (search_lower in name_lower or 
+                search_lower in category_lower or
+                search_lower in subcategory_lower or
+                any(search_lower in tag for tag in tags_lower)):
+                matching_items.append(item)
+        
+        self._search_cache[search_lower] = matching_items
+        if len(self._search_cache) > SEARCH_CACHE_MAX:
+            self._search_cache.popitem(last=False)
+        return matching_items
+
     def _calculate_cart_total(self) -> float:
         """Calculate the total cost of items in the cart."""
-        total = 0.0
-        for cart_item in self.cart:
-            total += cart_item["price"] * cart_item["quantity"]
-        return round(total, 2)
+        return self._cart_total_cents() / 100
 
     def _check_dietary_restrictions(self, item: Dict) -> bool:
         """Check if an item meets dietary restrictions."""
-        if not self.dietary_restrictions:
-            return True
-        
-        item_tags = item.get("tags", [])
-        for restriction in self.dietary_restrictions:
-            if restriction not in item_tags:
-                return False
-        return True
+        item_tags = item.get("_tags_set")
+        if item_tags is None:
+            item_tags = frozenset(item.get("tags", []))
+        # An empty restriction set is a subset of any tags
+        return self._dietary_set <= item_tags
 
     @function_tool
     async def search_items(
@@ -185,29 +445,21 @@ class FoodGroceryAgent(Agent):
             search_term: The product name, category, or keyword to search for.
         """
         search_lower = search_term.lower()
-        matching_items = []
-        
-        for item in self.catalog:
-            if (search_lower in item["name"].lower() or 
-                search_lower in item["category"].lower() or
-                search_lower in item.get("subcategory", "").lower() or
-                any(search_lower in tag for tag in item.get("tags", []))):
-                matching_items.append(item)
+        # The LLM usually echoes an exact product name; answer those without a scan
+        exact_item = self._by_name_lower.get(search_lower)
+        matching_items = [exact_item] if exact_item else self._search_matches(search_lower)
         
         if not matching_items:
             return f"I couldn't find any items matching '{search_term}'. Try searching for categories like 'bread', 'milk', 'snacks', or 'pizza'."
         
         # Limit to top 5 results
-        result_items = matching_items[:5]
-        result = f"I found {len(matching_items)} items"
-        if len(matching_items) > 5:
-            result += f" (showing top 5)"
-        result += f" matching '{search_term}':\n\n"
-        
-        for item in result_items:
-            result += f"- {item['name']} ({item['brand']}, {item['size']}) - ${item['price']}\n"
-        
-        return result
+        shown = " (showing top 5)" if len(matching_items) > 5 else ""
+        lines = [f"I found {len(matching_items)} items{shown} matching '{search_term}':\n"]
+        lines.extend(
+            f"- {item['name']} ({item['brand']}, {item['size']}) - ${item['price']}"
+            for item in matching_items[:5]
+        )
+        return "\n".join(lines) + "\n"
 
     @function_tool
     async def add_to_cart(
@@ -235,33 +487,22 @@ class FoodGroceryAgent(Agent):
             return f"Note: {item['name']} doesn't match your dietary restrictions ({', '.join(self.dietary_restrictions)}). Would you still like to add it?"
         
         # Check if item already in cart
-        existing_item = None
-        for cart_item in self.cart:
-            if cart_item["id"] == item["id"]:
-                existing_item = cart_item
-                break
+        existing_item = self._cart_by_id.get(item["id"])
         
         if existing_item:
             existing_item["quantity"] += quantity
             response = f"Updated {item['name']} quantity to {existing_item['quantity']}."
         else:
-            cart_entry = {
-                "id": item["id"],
-                "name": item["name"],
-                "brand": item["brand"],
-                "size": item["size"],
-                "price": item["price"],
-                "quantity": quantity
-            }
-            self.cart.append(cart_entry)
+            self._add_cart_entry(item, quantity)
             response = f"Added {quantity} x {item['name']} ({item['brand']}, {item['size']}) at ${item['price']} each to your cart."
         
-        total = self._calculate_cart_total()
-        response += f" Cart total: ${total}"
+        total_cents = self._cart_total_cents()
+        response += f" Cart total: ${total_cents / 100}"
         
         # Check budget
-        if self.budget and total > self.budget:
-            response += f" ⚠️ Warning: You've exceeded your budget of ${self.budget} by ${round(total - self.budget, 2)}."
+        if self.budget and total_cents > self._budget_cents:
+            over_cents = total_cents - self._budget_cents
+            response += f" ⚠️ Warning: You've exceeded your budget of ${self.budget} by ${over_cents / 100}."
         
         logger.info(f"Added to cart: {item['name']} x {quantity}")
         return response
@@ -277,17 +518,8 @@ class FoodGroceryAgent(Agent):
         Args:
             dish_name: The name of the dish (e.g., "pasta", "peanut butter sandwich", "salad").
         """
-        dish_lower = dish_name.lower()
-        recipes = self.order_history.get("recipes", {})
-        
         # Find matching recipe
-        recipe_items = None
-        matched_recipe = None
-        for recipe_name, item_ids in recipes.items():
-            if dish_lower in recipe_name or recipe_name in dish_lower:
-                recipe_items = item_ids
-                matched_recipe = recipe_name
-                break
+        matched_recipe, recipe_items = self._find_recipe(dish_name.lower())
         
         if not recipe_items:
             return f"I don't have a specific recipe for '{dish_name}'. Try searching for individual items or ask me to add specific ingredients."
@@ -295,33 +527,17 @@ class FoodGroceryAgent(Agent):
         added_items = []
         for item_id in recipe_items:
             item = self._find_item_by_id(item_id)
-            if item and item.get("in_stock", False):
-                # Check if already in cart
-                existing = None
-                for cart_item in self.cart:
-                    if cart_item["id"] == item["id"]:
-                        existing = cart_item
-                        break
-                
-                if not existing:
-                    cart_entry = {
-                        "id": item["id"],
-                        "name": item["name"],
-                        "brand": item["brand"],
-                        "size": item["size"],
-                        "price": item["price"],
-                        "quantity": 1
-                    }
-                    self.cart.append(cart_entry)
-                    added_items.append(item["name"])
+            # Skip items that are out of stock or already in the cart
+            if item and item.get("in_stock", False) and item["id"] not in self._cart_by_id:
+                self._add_cart_entry(item, 1)
+                added_items.append(item["name"])
         
         if not added_items:
             return f"All ingredients for {matched_recipe} are already in your cart!"
         
         total = self._calculate_cart_total()
-        response = f"I've added these ingredients for {matched_recipe}:\n"
-        response += "\n".join([f"- {name}" for name in added_items])
-        response += f"\n\nCart total: ${total}"
+        items = "\n".join(f"- {name}" for name in added_items)
+        response = f"I've added these ingredients for {matched_recipe}:\n{items}\n\nCart total: ${total}"
         
         logger.info(f"Added ingredients for {matched_recipe}: {added_items}")
         return response
@@ -332,19 +548,20 @@ class FoodGroceryAgent(Agent):
         if not self.cart:
             return "Your cart is empty. Would you like to add some items?"
         
-        response = f"Here's what's in your cart ({len(self.cart)} items):\n\n"
-        for item in self.cart:
-            item_total = item["price"] * item["quantity"]
-            response += f"- {item['quantity']} x {item['name']} ({item['brand']}, {item['size']}) = ${item_total}\n"
+        lines = [f"Here's what's in your cart ({len(self.cart)} items):\n"]
+        lines.extend(
+            f"- {item['quantity']} x {item['name']} ({item['brand']}, {item['size']}) = ${_to_cents(item['price']) * item['quantity'] / 100}"
+            for item in self.cart
+        )
         
-        total = self._calculate_cart_total()
-        response += f"\n**Total: ${total}**"
+        total_cents = self._cart_total_cents()
+        lines.append(f"\n**Total: ${total_cents / 100}**")
         
         if self.budget:
-            remaining = self.budget - total
-            response += f"\nBudget: ${self.budget} (${remaining} remaining)" if remaining >= 0 else f"\nBudget: ${self.budget} (${abs(remaining)} over budget)"
+            remaining = (self._budget_cents - total_cents) / 100
+            lines.append(f"Budget: ${self.budget} (${remaining} remaining)" if remaining >= 0 else f"Budget: ${self.budget} (${abs(remaining)} over budget)")
         
-        return response
+        return "\n".join(lines)
 
     @function_tool
     async def update_quantity(
@@ -359,17 +576,13 @@ class FoodGroceryAgent(Agent):
             item_name: The name of the item to update.
             new_quantity: The new quantity (use 0 to remove the item).
         """
-        cart_item = None
-        for item in self.cart:
-            if item_name.lower() in item["name"].lower():
-                cart_item = item
-                break
+        cart_item = self._find_cart_item(item_name)
         
         if not cart_item:
             return f"'{item_name}' is not in your cart. Would you like to add it?"
         
         if new_quantity <= 0:
-            self.cart.remove(cart_item)
+            self._remove_cart_entry(cart_item)
             return f"Removed {cart_item['name']} from your cart. Cart total: ${self._calculate_cart_total()}"
         
         old_quantity = cart_item["quantity"]
@@ -392,16 +605,12 @@ class FoodGroceryAgent(Agent):
         Args:
             item_name: The name of the item to remove.
         """
-        cart_item = None
-        for item in self.cart:
-            if item_name.lower() in item["name"].lower():
-                cart_item = item
-                break
+        cart_item = self._find_cart_item(item_name)
         
         if not cart_item:
             return f"'{item_name}' is not in your cart."
         
-        self.cart.remove(cart_item)
+        self._remove_cart_entry(cart_item)
         total = self._calculate_cart_total()
         
         logger.info(f"Removed from cart: {cart_item['name']}")
@@ -419,11 +628,12 @@ class FoodGroceryAgent(Agent):
             budget_amount: The maximum amount to spend.
         """
         self.budget = budget_amount
-        current_total = self._calculate_cart_total()
+        current_total_cents = self._cart_total_cents()
+        current_total = current_total_cents / 100
         
         response = f"Budget set to ${budget_amount}. "
         if current_total > 0:
-            remaining = budget_amount - current_total
+            remaining = (self._budget_cents - current_total_cents) / 100
             if remaining >= 0:
                 response += f"Current cart total is ${current_total}. You have ${remaining} remaining."
             else:
@@ -457,14 +667,16 @@ class FoodGroceryAgent(Agent):
             return "Your cart is empty. Add some items before placing an order!"
         
         order_id = str(uuid.uuid4())[:8]
+        now = datetime.now()
+        now_iso = now.isoformat()
         order = {
             "id": order_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "items": self.cart.copy(),
             "total": self._calculate_cart_total(),
             "status": "received",
             "status_history": [
-                {"status": "received", "timestamp": datetime.now().isoformat()}
+                {"status": "received", "timestamp": now_iso}
             ]
         }
         
@@ -472,17 +684,23 @@ class FoodGroceryAgent(Agent):
         if "orders" not in self.order_history:
             self.order_history["orders"] = []
         self.order_history["orders"].append(order)
-        self._save_order_history()
+        self._archive_old_orders()
+        self._history_dirty = True
         
         # Generate receipt
-        response = f"✅ Order placed successfully!\n\n"
-        response += f"**Order ID: {order_id}**\n"
-        response += f"**Order Time: {datetime.now().strftime('%I:%M %p, %B %d, %Y')}**\n\n"
-        response += "Items:\n"
-        for item in order["items"]:
-            response += f"- {item['quantity']} x {item['name']} = ${item['price'] * item['quantity']}\n"
-        response += f"\n**Total: ${order['total']}**\n\n"
-        response += "Your order has been received and will be prepared shortly. You can track it using the order ID."
+        lines = [
+            "✅ Order placed successfully!\n",
+            f"**Order ID: {order_id}**",
+            f"**Order Time: {now.strftime('%I:%M %p, %B %d, %Y')}**\n",
+            "Items:",
+        ]
+        lines.extend(
+            f"- {item['quantity']} x {item['name']} = ${_to_cents(item['price']) * item['quantity'] / 100}"
+            for item in order["items"]
+        )
+        lines.append(f"\n**Total: ${order['total']}**\n")
+        lines.append("Your order has been received and will be prepared shortly. You can track it using the order ID.")
+        response = "\n".join(lines)
         
         # Clear cart
         self.cart = []
@@ -490,6 +708,22 @@ class FoodGroceryAgent(Agent):
         logger.info(f"Order placed: {order_id}, Total: ${order['total']}")
         return response
 
+    def _archive_old_orders(self):
+        """Move orders beyond MAX_RECENT_ORDERS from order history to the archive."""
+        orders = self.order_history["orders"]
+        overflow = len(orders) - MAX_RECENT_ORDERS
+        if overflow <= 0:
+            return
+        try:
+            _append_archived_orders(orders[:overflow])
+        except Exception as e:
+            # Keep the orders in history rather than lose them
+            logger.error(f"Error archiving orders: {e}")
+            return
+        del orders[:overflow]
+        self.order_history["archived_count"] = self.order_history.get("archived_count", 0) + overflow
+        logger.info(f"Archived {overflow} old orders")
+
     @function_tool
     async def track_order(
         self, 
@@ -507,30 +741,28 @@ class FoodGroceryAgent(Agent):
             return "You don't have any orders yet. Place your first order to get started!"
         
         # Find order
+        archived = False
         if order_id:
             order = None
             for o in orders:
                 if o["id"] == order_id:
                     order = o
                     break
+            if not order:
+                # Only recent orders are kept in memory
+                order = await asyncio.to_thread(_find_archived_order, order_id)
+                archived = order is not None
             if not order:
                 return f"I couldn't find an order with ID '{order_id}'."
         else:
             # Get most recent order
             order = orders[-1]
         
-        # Update status (mock progression)
-        self._update_order_status(order)
+        # Update status (mock progression); archived orders are read-only
+        if not archived:
+            self._update_order_status(order)
         
-        status_emoji = {
-            "received": "📦",
-            "confirmed": "✅",
-            "being_prepared": "👨‍🍳",
-            "out_for_delivery": "🚚",
-            "delivered": "🎉"
-        }
-        
-        emoji = status_emoji.get(order["status"], "📋")
+        emoji = STATUS_EMOJI.get(order["status"], "📋")
         status_text = order["status"].replace("_", " ").title()
         
         response = f"{emoji} **Order Status: {status_text}**\n\n"
@@ -550,28 +782,28 @@ class FoodGroceryAgent(Agent):
 
     def _update_order_status(self, order: Dict):
         """Update order status based on elapsed time (mock progression)."""
-        status_progression = ["received", "confirmed", "being_prepared", "out_for_delivery", "delivered"]
         current_status = order["status"]
         
         if current_status == "delivered":
             return
         
         # Calculate time elapsed since order
-        order_time = datetime.fromisoformat(order["timestamp"])
-        elapsed_minutes = (datetime.now() - order_time).total_seconds() / 60
+        now = datetime.now()
+        order_time = _parse_timestamp(order["timestamp"])
+        elapsed_minutes = (now - order_time).total_seconds() / 60
         
         # Progress status every 2 minutes (for demo purposes)
-        current_index = status_progression.index(current_status)
-        new_index = min(int(elapsed_minutes / 2), len(status_progression) - 1)
+        current_index = STATUS_INDEX[current_status]
+        new_index = min(int(elapsed_minutes / 2), len(STATUS_PROGRESSION) - 1)
         
         if new_index > current_index:
-            new_status = status_progression[new_index]
+            new_status = STATUS_PROGRESSION[new_index]
             order["status"] = new_status
             order["status_history"].append({
                 "status": new_status,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             })
-            self._save_order_history()
+            self._history_dirty = True
             logger.info(f"Order {order['id']} status updated: {current_status} -> {new_status}")
 
     @function_tool
@@ -582,18 +814,21 @@ class FoodGroceryAgent(Agent):
         if not orders:
             return "You don't have any order history yet. Place your first order to get started!"
         
-        response = f"You have {len(orders)} past order(s):\n\n"
+        total_orders = len(orders) + self.order_history.get("archived_count", 0)
+        lines = [f"You have {total_orders} past order(s):\n"]
         
         # Show last 5 orders
         recent_orders = orders[-5:]
         for order in reversed(recent_orders):
-            order_date = datetime.fromisoformat(order["timestamp"]).strftime("%b %d, %I:%M %p")
-            response += f"- Order {order['id']}: ${order['total']} ({len(order['items'])} items) - {order_date} - Status: {order['status']}\n"
+            order_date = _parse_timestamp(order["timestamp"]).strftime("%b %d, %I:%M %p")
+            lines.append(f"- Order {order['id']}: ${order['total']} ({len(order['items'])} items) - {order_date} - Status: {order['status']}")
         
-        if len(orders) > 5:
-            response += f"\n(Showing 5 most recent orders)"
+        if total_orders > 5:
+            lines.append("\n(Showing 5 most recent orders)")
+        else:
+            lines.append("")
         
-        return response
+        return "\n".join(lines)
 
     @function_tool
     async def reorder_last(self, context: RunContext) -> str:
@@ -611,32 +846,19 @@ class FoodGroceryAgent(Agent):
             item = self._find_item_by_id(order_item["id"])
             if item and item.get("in_stock", False):
                 # Check if already in cart
-                existing = None
-                for cart_item in self.cart:
-                    if cart_item["id"] == item["id"]:
-                        existing = cart_item
-                        break
+                existing = self._cart_by_id.get(item["id"])
                 
                 if existing:
                     existing["quantity"] += order_item["quantity"]
                 else:
-                    cart_entry = {
-                        "id": item["id"],
-                        "name": item["name"],
-                        "brand": item["brand"],
-                        "size": item["size"],
-                        "price": item["price"],
-                        "quantity": order_item["quantity"]
-                    }
-                    self.cart.append(cart_entry)
+                    self._add_cart_entry(item, order_item["quantity"])
                 items_added.append(f"{order_item['quantity']} x {item['name']}")
         
         if not items_added:
             return "None of the items from your last order are currently available."
         
-        response = "I've added items from your last order to your cart:\n"
-        response += "\n".join([f"- {item}" for item in items_added])
-        response += f"\n\nCart total: ${self._calculate_cart_total()}"
+        items = "\n".join(f"- {item}" for item in items_added)
+        response = f"I've added items from your last order to your cart:\n{items}\n\nCart total: ${self._calculate_cart_total()}"
         
         logger.info(f"Reordered {len(items_added)} items from last order")
         return response
@@ -644,6 +866,8 @@ class FoodGroceryAgent(Agent):
 
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
+    # Parse and index the catalog before any room is assigned
+    proc.userdata["catalog_bundle"] = _load_catalog_bundle(_catalog_mtime())
 
 
 async def entrypoint(ctx: JobContext):
@@ -685,14 +909,27 @@ async def entrypoint(ctx: JobContext):
     ctx.add_shutdown_callback(log_usage)
 
     # Start the session
-    agent = FoodGroceryAgent(room=ctx.room)
+    agent = FoodGroceryAgent(room=ctx.room, catalog_bundle=ctx.proc.userdata.get("catalog_bundle"))
+    
+    # Write order history changes in the background and once more on shutdown
+    autosave_task = asyncio.create_task(agent.autosave_order_history())
+
+    async def save_order_history():
+        autosave_task.cancel()
+        agent.flush_order_history()
+
+    ctx.add_shutdown_callback(save_order_history)
     
-    await session.start(
-        agent=agent,
-        room=ctx.room,
-        room_input_options=RoomInputOptions(
-            noise_cancellation=noise_cancellation.BVC(),
+    # Read order history in a worker thread while the session starts
+    await asyncio.gather(
+        session.start(
+            agent=agent,
+            room=ctx.room,
+            room_input_options=RoomInputOptions(
+                noise_cancellation=noise_cancellation.BVC(),
+            ),
         ),
+        agent.preload_order_history(),
     )
 
     # Join the room and connect to the user
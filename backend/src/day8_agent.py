@@ -1,5 +1,7 @@
-import logging
+import asyncio
+import copy
 import json
+import logging
 import random
 from datetime import datetime
 from pathlib import Path
@@ -25,6 +27,8 @@ from livekit.agents import (
 from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
+import fast_json
+
 logger = logging.getLogger("day8_agent")
 
 load_dotenv(".env.local")
@@ -32,6 +36,53 @@ load_dotenv(".env.local")
 # Paths
 SAVES_FILE = Path(__file__).parent.parent / "day8_saves.json"
 
+# Seconds to wait for further state changes before broadcasting world state
+BROADCAST_DEBOUNCE = 0.015
+
+# Most recent history entries kept in the world state
+HISTORY_LIMIT = 50
+
+# Dice outcome by roll total; totals below 0 or above 15 use the first or last entry
+OUTCOME_TABLE = (
+    ("Critical Failure",) * 5
+    + ("Partial Success / Complication",) * 5
+    + ("Success",) * 5
+    + ("Great Success",)
+)
+
+# World state for a new session; each agent works on its own deep copy
+DEFAULT_WORLD_STATE: Dict[str, Any] = {
+    "universe": None,
+    "character": {
+        "name": "Traveler",
+        "hp": 20,
+        "max_hp": 20,
+        "stats": {"strength": 10, "agility": 10, "intelligence": 10},
+        "inventory": [],
+        "status": "Healthy"
+    },
+    "location": "Unknown",
+    "quest": "None",
+    "turn_count": 0,
+    "history": []
+}
+
+# Starting inventory and stats by keyword in the universe name, checked in order
+UNIVERSE_PRESETS: Dict[str, Dict[str, Any]] = {
+    "fantasy": {
+        "inventory": ("Rusty Sword", "Rations", "Water Skin"),
+        "stats": {"strength": 12, "agility": 10, "intelligence": 8},
+    },
+    "cyberpunk": {
+        "inventory": ("Datapad", "Credit Chip", "Multi-tool"),
+        "stats": {"strength": 10, "agility": 12, "intelligence": 10},
+    },
+    "zombie": {
+        "inventory": ("Flashlight", "Baseball Bat", "Bandages"),
+        "stats": {"strength": 11, "agility": 11, "intelligence": 9},
+    },
+}
+
 class GameMasterAgent(Agent):
     def __init__(self, room: rtc.Room) -> None:
         super().__init__(
@@ -71,40 +122,85 @@ class GameMasterAgent(Agent):
             """,
         )
         self.room = room
-        self.world_state: Dict[str, Any] = {
-            "universe": None,
-            "character": {
-                "name": "Traveler",
-                "hp": 20,
-                "max_hp": 20,
-                "stats": {"strength": 10, "agility": 10, "intelligence": 10},
-                "inventory": [],
-                "status": "Healthy"
-            },
-            "location": "Unknown",
-            "quest": "None",
-            "turn_count": 0,
-            "history": []
-        }
+        self.world_state: Dict[str, Any] = copy.deepcopy(DEFAULT_WORLD_STATE)
+        
+        # Save name -> world state, mirrored from SAVES_FILE
+        self._saves: Dict[str, Any] = {}
+        # SAVES_FILE's mtime when _saves was last read or written
+        self._saves_mtime: Optional[int] = None
+        # World state changed since the last broadcast
+        self._state_dirty = False
+        self._publish_task: Optional[asyncio.Task] = None
+        # Last payload sent per topic, so unchanged data isn't published again
+        self._last_payloads: Dict[str, str] = {}
         
         # Load saves if available (to check for existing saves, though we start fresh by default unless requested)
         self._ensure_saves_file()
 
     def _ensure_saves_file(self):
         if not SAVES_FILE.exists():
-            with open(SAVES_FILE, "w") as f:
-                json.dump({}, f)
+            self._flush_saves()
+        else:
+            self._refresh_saves()
+
+    def _refresh_saves(self):
+        """Re-read SAVES_FILE if another session has written it since we last did."""
+        try:
+            mtime = SAVES_FILE.stat().st_mtime_ns
+            if mtime == self._saves_mtime:
+                return
+            with open(SAVES_FILE, "rb") as f:
+                self._saves = fast_json.loads(f.read())
+            self._saves_mtime = mtime
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to read saves: {e}")
+
+    def _flush_saves(self):
+        """Write all saves to SAVES_FILE in one atomic replace."""
+        fast_json.write_atomic(SAVES_FILE, self._saves, indent=True)
+        self._saves_mtime = SAVES_FILE.stat().st_mtime_ns
+
+    def _mark_dirty(self):
+        """Schedule a world state broadcast, coalescing changes made in quick succession."""
+        self._state_dirty = True
+        if self._publish_task is None or self._publish_task.done():
+            self._publish_task = asyncio.create_task(self._flush_state_soon())
+
+    async def _flush_state_soon(self):
+        # Loops so that changes made while a publish is in flight are sent too
+        while self._state_dirty:
+            await asyncio.sleep(BROADCAST_DEBOUNCE)
+            await self.flush_state()
+
+    async def flush_state(self):
+        """Broadcast the world state now if it has changed since the last broadcast."""
+        if not self._state_dirty:
+            return
+        self._state_dirty = False
+        await self._broadcast_state()
 
     async def _broadcast_state(self):
-        """Broadcast the current world state to the frontend."""
+        """Broadcast the current world state to the frontend.
+
+        History goes out on its own topic, so the frequent world_state
+        message stays small as the session grows.
+        """
         try:
-            payload = json.dumps(self.world_state)
-            if self.room and self.room.local_participant:
-                await self.room.local_participant.publish_data(payload, topic="world_state")
-                logger.info("Broadcasted world state")
+            state = {key: value for key, value in self.world_state.items() if key != "history"}
+            await self._publish_if_changed("world_state", fast_json.dumps(state))
+            history = self.world_state.get("history", [])
+            await self._publish_if_changed("history", fast_json.dumps(history[-HISTORY_LIMIT:]))
         except Exception as e:
             logger.error(f"Failed to broadcast state: {e}")
 
+    async def _publish_if_changed(self, topic: str, payload: str):
+        if payload == self._last_payloads.get(topic):
+            return
+        if self.room and self.room.local_participant:
+            await self.room.local_participant.publish_data(payload, topic=topic)
+            self._last_payloads[topic] = payload
+            logger.info(f"Broadcasted {topic}")
+
     @function_tool
     async def initialize_universe(
         self, 
@@ -122,17 +218,15 @@ class GameMasterAgent(Agent):
         self.world_state["character"]["name"] = character_name
         
         # Set default stats based on universe
-        if "fantasy" in universe_type.lower():
-            self.world_state["character"]["inventory"] = ["Rusty Sword", "Rations", "Water Skin"]
-            self.world_state["character"]["stats"] = {"strength": 12, "agility": 10, "intelligence": 8}
-        elif "cyberpunk" in universe_type.lower():
-            self.world_state["character"]["inventory"] = ["Datapad", "Credit Chip", "Multi-tool"]
-            self.world_state["character"]["stats"] = {"strength": 10, "agility": 12, "intelligence": 10}
-        elif "zombie" in universe_type.lower():
-            self.world_state["character"]["inventory"] = ["Flashlight", "Baseball Bat", "Bandages"]
-            self.world_state["character"]["stats"] = {"strength": 11, "agility": 11, "intelligence": 9}
+        universe_lower = universe_type.lower()
+        preset_key = next((key for key in UNIVERSE_PRESETS if key in universe_lower), None)
+        if preset_key is not None:
+            preset = UNIVERSE_PRESETS[preset_key]
+            # Copies, since tools mutate the inventory in place
+            self.world_state["character"]["inventory"] = list(preset["inventory"])
+            self.world_state["character"]["stats"] = dict(preset["stats"])
             
-        await self._broadcast_state()
+        self._mark_dirty()
         logger.info(f"Initialized universe: {universe_type}")
         return f"Universe set to {universe_type}. Character {character_name} is ready. Inventory: {', '.join(self.world_state['character']['inventory'])}."
 
@@ -154,15 +248,7 @@ class GameMasterAgent(Agent):
         roll = random.randint(1, sides)
         total = roll + modifier
         
-        outcome = "Failure"
-        if total >= 15:
-            outcome = "Great Success"
-        elif total >= 10:
-            outcome = "Success"
-        elif total >= 5:
-            outcome = "Partial Success / Complication"
-        else:
-            outcome = "Critical Failure"
+        outcome = OUTCOME_TABLE[max(0, min(total, len(OUTCOME_TABLE) - 1))]
             
         result_text = f"Rolled d{sides}: {roll} + {modifier} = {total}. Outcome: {outcome}"
         logger.info(f"Dice Roll ({reason}): {result_text}")
@@ -208,7 +294,7 @@ class GameMasterAgent(Agent):
         else:
             return "Invalid action."
             
-        await self._broadcast_state()
+        self._mark_dirty()
         return msg
 
     @function_tool
@@ -237,7 +323,7 @@ class GameMasterAgent(Agent):
         else:
             char["status"] = "Healthy"
             
-        await self._broadcast_state()
+        self._mark_dirty()
         logger.info(f"Health update ({reason}): {old_hp} -> {char['hp']}")
         return f"HP changed by {amount}. Current HP: {char['hp']}/{char['max_hp']} ({char['status']})."
 
@@ -248,17 +334,12 @@ class GameMasterAgent(Agent):
         Args:
             save_name: Name for the save file.
         """
-        try:
-            with open(SAVES_FILE, "r") as f:
-                saves = json.load(f)
-        except:
-            saves = {}
+        self._refresh_saves()
             
         self.world_state["timestamp"] = datetime.now().isoformat()
-        saves[save_name] = self.world_state
-        
-        with open(SAVES_FILE, "w") as f:
-            json.dump(saves, f, indent=2)
+        # Snapshot, so play after saving doesn't change the save
+        self._saves[save_name] = copy.deepcopy(self.world_state)
+        self._flush_saves()
             
         logger.info(f"Game saved as '{save_name}'")
         return f"Game saved successfully as '{save_name}'."
@@ -273,14 +354,18 @@ class GameMasterAgent(Agent):
         if not SAVES_FILE.exists():
             return "No save file found."
             
-        with open(SAVES_FILE, "r") as f:
-            saves = json.load(f)
+        self._refresh_saves()
+        saves = self._saves
             
         if save_name not in saves:
             return f"Save '{save_name}' not found. Available saves: {', '.join(saves.keys())}"
             
-        self.world_state = saves[save_name]
-        await self._broadcast_state()
+        self.world_state = copy.deepcopy(saves[save_name])
+        # Saves written before the limit may carry longer histories
+        history = self.world_state.get("history")
+        if history is not None:
+            del history[:-HISTORY_LIMIT]
+        self._mark_dirty()
         logger.info(f"Game loaded from '{save_name}'")
         
         char = self.world_state["character"]
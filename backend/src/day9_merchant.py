@@ -1,78 +1,167 @@
 import json
 import os
+import secrets
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
-import uuid
+
+import fast_json
+
+try:
+    import numpy as np
+except ImportError:  # Optional: large catalogs filter in pure Python without it
+    np = None
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "day9_data")
 SHARED_DATA_DIR = os.path.join(BASE_DIR, "shared-data")
 CATALOG_FILE = os.path.join(DATA_DIR, "catalog.json")
-ORDERS_FILE = os.path.join(SHARED_DATA_DIR, "ecommerce_orders.json")
+# Append-only order log, one JSON order per line
+ORDERS_FILE = os.path.join(SHARED_DATA_DIR, "ecommerce_orders.jsonl")
+# Orders saved before the log existed; read on load, never rewritten
+LEGACY_ORDERS_FILE = os.path.join(SHARED_DATA_DIR, "ecommerce_orders.json")
+
+# Random per-process half of the 8-hex-digit order IDs (short enough to read aloud);
+# a 4-digit counter fills the other half, skipping IDs already in the orders file
+ORDER_ID_PREFIX = secrets.token_hex(2).upper()
+
+# Catalogs at least this large filter by price with NumPy column arrays;
+# below it, array setup costs more than the list comprehensions it replaces
+VECTORIZE_MIN_PRODUCTS = 1000
 
 class Catalog:
+    __slots__ = (
+        "_by_category",
+        "_by_id",
+        "_cart_info",
+        "_category_code_by_name",
+        "_category_codes",
+        "_prices",
+        "products",
+    )
+
     def __init__(self):
         self.products = self._load_catalog()
+        # Product ID -> product, for get_product
+        self._by_id = {}
+        # Lowercase category -> products in catalog order
+        self._by_category = defaultdict(list)
+        # Product ID -> (name, price, currency), the fields a cart line needs
+        self._cart_info = {}
+        for p in self.products:
+            self._by_id.setdefault(p["id"], p)
+            self._cart_info.setdefault(p["id"], (p["name"], p["price"], p.get("currency", "INR")))
+            # Lowercased copies of the searchable fields; the originals are kept for display
+            p["_name_lc"] = p.get("name", "").lower()
+            p["_desc_lc"] = p.get("description", "").lower()
+            p["_category_lc"] = p.get("category", "").lower()
+            self._by_category[p["_category_lc"]].append(p)
+        
+        # Price and category-code columns, in catalog order
+        self._prices = None
+        self._category_codes = None
+        self._category_code_by_name = {}
+        if np is not None and len(self.products) >= VECTORIZE_MIN_PRODUCTS:
+            self._category_code_by_name = {name: code for code, name in enumerate(self._by_category)}
+            self._prices = np.asarray([p.get("price", 0) for p in self.products], dtype=np.float64)
+            self._category_codes = np.asarray(
+                [self._category_code_by_name[p["_category_lc"]] for p in self.products], dtype=np.int32
+            )
 
     def _load_catalog(self) -> List[Dict[str, Any]]:
         if not os.path.exists(CATALOG_FILE):
             return []
-        with open(CATALOG_FILE, "r") as f:
-            return json.load(f)
+        with open(CATALOG_FILE, "rb") as f:
+            return fast_json.loads(f.read())
 
-    def list_products(self, category: Optional[str] = None, max_price: Optional[float] = None, search_term: Optional[str] = None) -> List[Dict[str, Any]]:
-        results = self.products
-        
+    def _filter_by_price(self, category: Optional[str], max_price: float) -> List[Dict[str, Any]]:
+        mask = self._prices <= max_price
         if category:
-            results = [p for p in results if p.get("category", "").lower() == category.lower()]
+            code = self._category_code_by_name.get(category.lower())
+            if code is None:
+                return []
+            mask &= self._category_codes == code
+        products = self.products
+        return [products[i] for i in np.flatnonzero(mask)]
+
+    def list_products(self, category: Optional[str] = None, max_price: Optional[float] = None, search_term: Optional[str] = None) -> List[Dict[str, Any]]:
+        if max_price and self._prices is not None:
+            results = self._filter_by_price(category, max_price)
+        elif category:
+            results = self._by_category.get(category.lower(), [])
+        else:
+            results = self.products
         
-        if max_price:
+        if max_price and self._prices is None:
             results = [p for p in results if p.get("price", 0) <= max_price]
             
         if search_term:
             term = search_term.lower()
             results = [
                 p for p in results 
-                if term in p.get("name", "").lower() or term in p.get("description", "").lower()
+                if term in p["_name_lc"] or term in p["_desc_lc"]
             ]
             
         return results
 
     def get_product(self, product_id: str) -> Optional[Dict[str, Any]]:
-        for p in self.products:
-            if p["id"] == product_id:
-                return p
-        return None
+        return self._by_id.get(product_id)
 
 class OrderManager:
-    def __init__(self):
+    __slots__ = ("_order_ids", "_order_seq", "catalog", "orders")
+
+    def __init__(self, catalog: Optional[Catalog] = None):
+        # Defaults to the shared catalog, so orders don't re-read catalog.json
+        self.catalog = catalog if catalog is not None else catalog_instance
         self.orders = self._load_orders()
+        self._order_seq = 0
+        # IDs already on file, so a reused prefix never produces a duplicate ID
+        self._order_ids = {o.get("id") for o in self.orders}
 
     def _load_orders(self) -> List[Dict[str, Any]]:
-        if not os.path.exists(ORDERS_FILE):
-            return []
-        try:
-            with open(ORDERS_FILE, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return []
+        orders = []
+        if os.path.exists(LEGACY_ORDERS_FILE):
+            try:
+                with open(LEGACY_ORDERS_FILE, "rb") as f:
+                    orders.extend(fast_json.loads(f.read()))
+            except json.JSONDecodeError:
+                pass
+        if os.path.exists(ORDERS_FILE):
+            with open(ORDERS_FILE, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        orders.append(fast_json.loads(line))
+                    except json.JSONDecodeError:
+                        # Skip a line left partly written by an interrupted append
+                        continue
+        return orders
+
+    def _next_order_id(self) -> str:
+        while True:
+            self._order_seq += 1
+            order_id = f"ORD-{ORDER_ID_PREFIX}{self._order_seq:04X}"
+            if order_id not in self._order_ids:
+                self._order_ids.add(order_id)
+                return order_id
 
-    def _save_orders(self):
-        with open(ORDERS_FILE, "w") as f:
-            json.dump(self.orders, f, indent=2)
+    def _append_order(self, order: Dict[str, Any]):
+        with open(ORDERS_FILE, "a") as f:
+            f.write(fast_json.dumps(order) + "\n")
 
     def create_order(self, items: List[Dict[str, Any]], buyer_info: Dict[str, str] = None) -> Dict[str, Any]:
         """
         items: List of dicts with {"product_id": str, "quantity": int, "options": dict}
         """
-        catalog = Catalog()
         order_items = []
         total_amount = 0.0
         currency = "INR" # Default to INR for TechStyle Store
 
         for item in items:
-            product = catalog.get_product(item["product_id"])
+            product = self.catalog.get_product(item["product_id"])
             if not product:
                 continue
             
@@ -91,7 +180,7 @@ class OrderManager:
             })
 
         order = {
-            "id": f"ORD-{uuid.uuid4().hex[:8].upper()}",
+            "id": self._next_order_id(),
             "created_at": datetime.now().isoformat(),
             "status": "CONFIRMED",
             "buyer": buyer_info or {"name": "Guest", "email": "guest@example.com"},
@@ -106,7 +195,7 @@ class OrderManager:
         }
 
         self.orders.append(order)
-        self._save_orders()
+        self._append_order(order)
         return order
 
     def get_last_order(self) -> Optional[Dict[str, Any]]:
@@ -123,42 +212,43 @@ order_manager_instance = OrderManager()
 
 # Simple in-memory cart for the demo (single user)
 class CartManager:
+    __slots__ = ("items",)
+
     def __init__(self):
         self.items = []
 
     def add_item(self, product_id: str, quantity: int = 1, options: Dict[str, Any] = None):
-        product = catalog_instance.get_product(product_id)
-        if not product:
+        info = catalog_instance._cart_info.get(product_id)
+        if info is None:
             return False, "Product not found."
+        name, price, currency = info
         
         self.items.append({
             "product_id": product_id,
-            "name": product["name"],
+            "name": name,
             "quantity": quantity,
             "options": options or {},
-            "unit_price": product["price"],
-            "currency": product["currency"]
+            "unit_price": price,
+            "currency": currency
         })
-        return True, f"Added {quantity}x {product['name']} to cart."
+        return True, f"Added {quantity}x {name} to cart."
 
     def view_cart(self) -> str:
         if not self.items:
             return "Your cart is empty."
         
-        summary = "--- Your Cart ---\n"
-        total = 0.0
-        currency = "INR"
-        for i, item in enumerate(self.items):
-            item_total = item['quantity'] * item['unit_price']
-            total += item_total
-            currency = item['currency']
-            summary += f"{i+1}. {item['quantity']}x {item['name']} ({item['unit_price']} {currency})"
+        lines = ["--- Your Cart ---"]
+        for i, item in enumerate(self.items, 1):
+            line = f"{i}. {item['quantity']}x {item['name']} ({item['unit_price']} {item['currency']})"
             if item['options']:
-                summary += f" | {item['options']}"
-            summary += "\n"
+                line += f" | {item['options']}"
+            lines.append(line)
         
-        summary += f"Total: {round(total, 2)} {currency}"
-        return summary
+        total = sum((item['quantity'] * item['unit_price'] for item in self.items), 0.0)
+        # The total is labelled with the last item's currency
+        currency = self.items[-1]['currency']
+        lines.append(f"Total: {round(total, 2)} {currency}")
+        return "\n".join(lines)
 
     def clear_cart(self):
         self.items = []
@@ -168,6 +258,22 @@ class CartManager:
 
 cart_instance = CartManager()
 
+def _format_product(p: Dict[str, Any]) -> str:
+    lines = [
+        f"- {p['name']} ({p['category']}): {p['price']} {p['currency']}\n",
+        f"  ID: {p['id']}\n",
+        f"  {p['description']}\n",
+    ]
+    if "attributes" in p:
+        attrs = ", ".join([f"{k}: {v}" for k, v in p["attributes"].items()])
+        lines.append(f"  Options: {attrs}\n")
+    lines.append("\n")
+    return "".join(lines)
+
+@lru_cache(maxsize=128)
+def _email_for(buyer_name: str) -> str:
+    return f"{buyer_name.lower().replace(' ', '.')}@example.com"
+
 # Public API functions for the Agent
 def search_catalog(query: str = None, category: str = None, max_price: float = None) -> str:
     """Searches the product catalog and returns a formatted string of results."""
@@ -175,16 +281,14 @@ def search_catalog(query: str = None, category: str = None, max_price: float = N
     if not products:
         return "No products found matching your criteria."
     
-    result_str = f"Found {len(products)} products:\n"
+    parts = [f"Found {len(products)} products:\n"]
     for p in products:
-        result_str += f"- {p['name']} ({p['category']}): {p['price']} {p['currency']}\n"
-        result_str += f"  ID: {p['id']}\n"
-        result_str += f"  {p['description']}\n"
-        if "attributes" in p:
-            attrs = ", ".join([f"{k}: {v}" for k, v in p["attributes"].items()])
-            result_str += f"  Options: {attrs}\n"
-        result_str += "\n"
-    return result_str
+        # The catalog doesn't change at runtime, so each product is formatted once
+        display = p.get("_display")
+        if display is None:
+            display = p["_display"] = _format_product(p)
+        parts.append(display)
+    return "".join(parts)
 
 def add_to_cart(product_id: str, quantity: int = 1, options: Dict[str, Any] = None) -> str:
     """Adds an item to the shopping cart."""
@@ -211,7 +315,7 @@ def checkout(buyer_name: str = "Guest") -> str:
             "options": item["options"]
         })
     
-    buyer_info = {"name": buyer_name, "email": f"{buyer_name.lower().replace(' ', '.')}@example.com"}
+    buyer_info = {"name": buyer_name, "email": _email_for(buyer_name)}
     order = order_manager_instance.create_order(order_items, buyer_info)
     cart_instance.clear_cart()
     return f"Order placed successfully! Order ID: {order['id']}. Total: {order['total']['amount']} {order['total']['currency']}."
@@ -224,7 +328,7 @@ def place_order(items: List[Dict[str, Any]], buyer_name: str = "Guest") -> str:
     if not items:
         return "Cannot place an empty order."
     
-    buyer_info = {"name": buyer_name, "email": f"{buyer_name.lower().replace(' ', '.')}@example.com"}
+    buyer_info = {"name": buyer_name, "email": _email_for(buyer_name)}
     order = order_manager_instance.create_order(items, buyer_info)
     return f"Order placed successfully! Order ID: {order['id']}. Total: {order['total']['amount']} {order['total']['currency']}."
 
@@ -234,18 +338,20 @@ def get_last_order_summary() -> str:
     if not order:
         return "No recent orders found."
     
-    summary = f"Last Order ({order['id']}) - {order['created_at']}:\n"
-    summary += f"Status: {order.get('status', 'Unknown')}\n"
-    summary += f"Buyer: {order.get('buyer', {}).get('name', 'Guest')}\n"
+    parts = [
+        f"Last Order ({order['id']}) - {order['created_at']}:\n",
+        f"Status: {order.get('status', 'Unknown')}\n",
+        f"Buyer: {order.get('buyer', {}).get('name', 'Guest')}\n",
+    ]
     
     for item in order['items']:
-        summary += f"- {item['quantity']}x {item['name']} @ {item.get('unit_amount', item.get('unit_price'))} = {item['total_price']}\n"
+        parts.append(f"- {item['quantity']}x {item['name']} @ {item.get('unit_amount', item.get('unit_price'))} = {item['total_price']}\n")
         if item.get("options"):
-            summary += f"  Options: {item['options']}\n"
+            parts.append(f"  Options: {item['options']}\n")
     
     total = order.get('total', {})
-    summary += f"Total: {total.get('amount', order.get('total_amount'))} {total.get('currency', order.get('currency'))}"
-    return summary
+    parts.append(f"Total: {total.get('amount', order.get('total_amount'))} {total.get('currency', order.get('currency'))}")
+    return "".join(parts)
 
 if __name__ == "__main__":
     # Test
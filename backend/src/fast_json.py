@@ -0,0 +1,101 @@
+"""JSON encoding helpers that use orjson when it is installed.
+
+orjson is an optional speedup. Every helper falls back to the standard library
+``json`` module, so agents behave the same whether or not it is available.
+"""
+
+import contextlib
+import json
+import os
+import stat
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional dependency: install with `uv add orjson`
+    orjson = None
+
+# Process umask, read once: os.umask can only be queried by setting it, which would
+# briefly affect files created by other threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document from a string or bytes.
+
+    Raises json.JSONDecodeError on invalid input (orjson's error subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize ``obj`` to a JSON string.
+
+    Args:
+        obj: The object to serialize
+        indent: Pretty-print with two-space indentation; output is compact otherwise
+
+    Returns:
+        The JSON document as text
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode()
+    if indent:
+        return json.dumps(obj, indent=2)
+    # Match orjson's compact output: no spaces after separators
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def write_atomic(path: str | Path, obj: Any, indent: bool = False) -> None:
+    """Serialize ``obj`` to ``path`` without exposing a partially written file.
+
+    The document is written to a sibling temporary file, which then replaces
+    ``path`` in one rename, so concurrent readers see either the old or the new
+    contents. The replaced file keeps its permissions; a new file gets the
+    default mode for the process umask.
+
+    Args:
+        path: Destination file
+        obj: The object to serialize
+        indent: Pretty-print with two-space indentation
+    """
+    _replace_atomic(path, dumps(obj, indent=indent))
+
+
+def write_lines_atomic(path: str | Path, objs: Iterable[Any]) -> None:
+    """Write ``objs`` to ``path`` as JSON Lines, replacing the file like write_atomic.
+
+    Args:
+        path: Destination file
+        objs: The objects to serialize, one compact document per line
+    """
+    _replace_atomic(path, "".join(dumps(obj) + "\n" for obj in objs))
+
+
+def _replace_atomic(path: str | Path, text: str) -> None:
+    """Replace ``path`` with ``text`` through a sibling temporary file."""
+    path = Path(path)
+    # mkstemp creates the file as 0600; give it the mode the destination has or would get
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    # A unique name per call, so concurrent writers never share a temporary file
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a stale temporary file behind
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
@@ -4,9 +4,12 @@ This module provides optional MCP integration features. MCP support is only
 enabled if the appropriate environment variables and configuration are set.
 """
 
+import asyncio
+import contextlib
 import logging
 import os
-from typing import Any
+import time
+from typing import Any, Optional
 
 logger = logging.getLogger("mcp_tools")
 
@@ -14,12 +17,118 @@ logger = logging.getLogger("mcp_tools")
 MCP_ENABLED = os.getenv("ENABLE_MCP", "false").lower() == "true"
 TODOIST_API_TOKEN = os.getenv("TODOIST_API_TOKEN", "")
 
+# Seconds a warm Todoist MCP session may sit unused before it is shut down
+SESSION_IDLE_TIMEOUT = 300.0
+
 
 def is_mcp_available() -> bool:
     """Check if MCP integration is properly configured."""
     return MCP_ENABLED and bool(TODOIST_API_TOKEN)
 
 
+class _TodoistSession:
+    """A Todoist MCP server process and client session kept warm between calls.
+
+    The stdio client and session contexts are entered and exited by one
+    background task, since their cancel scopes must close in the task that
+    opened them. Callers only borrow the session.
+    """
+
+    def __init__(self) -> None:
+        self._session = None
+        self._runner: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        # Event loop the lock and runner belong to
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_used = 0.0
+
+    def _bind_loop(self) -> None:
+        """Drop state left on another event loop, e.g. by an earlier job or test."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # A runner on another loop can't be awaited from this one
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._session = None
+        self._runner = None
+        self._closing = None
+
+    async def get(self):
+        """Return the warm session, starting the server on first use."""
+        self._bind_loop()
+        async with self._lock:
+            # Mark use before any await, so the runner doesn't idle out under us
+            self._last_used = time.monotonic()
+            if self._session is None:
+                ready = asyncio.get_running_loop().create_future()
+                self._closing = asyncio.Event()
+                self._runner = asyncio.create_task(self._run(ready, self._closing))
+                await ready
+            return self._session
+
+    async def _run(self, ready: asyncio.Future, closing: asyncio.Event) -> None:
+        session = None
+        # Import MCP client here to make it optional
+        try:
+            from mcp import ClientSession, StdioServerParameters
+            from mcp.client.stdio import stdio_client
+            
+            # Configure Todoist MCP server
+            server_params = StdioServerParameters(
+                command="npx",
+                args=["-y", "@modelcontextprotocol/server-todoist"],
+                env={"TODOIST_API_TOKEN": TODOIST_API_TOKEN},
+            )
+            
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self._session = session
+                    ready.set_result(session)
+                    await self._wait_until_idle(closing)
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not isinstance(e, asyncio.CancelledError):
+                logger.error(f"Todoist MCP session ended: {e}")
+        finally:
+            # Leave a session started on a newer loop in place
+            if self._session is session:
+                self._session = None
+
+    async def _wait_until_idle(self, closing: asyncio.Event) -> None:
+        while not closing.is_set():
+            idle = time.monotonic() - self._last_used
+            if idle >= SESSION_IDLE_TIMEOUT:
+                logger.info("Closing idle Todoist MCP session")
+                return
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(closing.wait(), SESSION_IDLE_TIMEOUT - idle)
+
+    async def close(self) -> None:
+        """Shut the server down; the next get() starts a fresh one."""
+        self._bind_loop()
+        runner = self._runner
+        if runner is None:
+            return
+        self._runner = None
+        self._closing.set()
+        try:
+            await runner
+        except Exception as e:
+            logger.error(f"Error closing Todoist MCP session: {e}")
+
+
+_todoist_session = _TodoistSession()
+
+
+async def close_mcp_sessions() -> None:
+    """Close warm MCP sessions. Agents register this as a shutdown callback."""
+    await _todoist_session.close()
+
+
 async def create_todoist_tasks(goals: list[str]) -> dict[str, Any]:
     """Create Todoist tasks from a list of goals.
     
@@ -42,30 +151,14 @@ async def create_todoist_tasks(goals: list[str]) -> dict[str, Any]:
         }
     
     try:
-        # Import MCP client here to make it optional
-        from mcp import ClientSession, StdioServerParameters
-        from mcp.client.stdio import stdio_client
-        
-        # Configure Todoist MCP server
-        server_params = StdioServerParameters(
-            command="npx",
-            args=["-y", "@modelcontextprotocol/server-todoist"],
-            env={"TODOIST_API_TOKEN": TODOIST_API_TOKEN},
-        )
+        session = await _todoist_session.get()
         
-        created_tasks = []
-        
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                
-                # Create a task for each goal
-                for goal in goals:
-                    result = await session.call_tool(
-                        "add_task",
-                        arguments={"content": goal}
-                    )
-                    created_tasks.append(result)
+        # Create a task for each goal; the requests share the session
+        # concurrently instead of waiting on one round-trip per goal
+        created_tasks = await asyncio.gather(*(
+            session.call_tool("add_task", arguments={"content": goal})
+            for goal in goals
+        ))
         
         return {
             "success": True,
@@ -84,6 +177,8 @@ async def create_todoist_tasks(goals: list[str]) -> dict[str, Any]:
         }
     except Exception as e:
         logger.error(f"Failed to create Todoist tasks: {e}")
+        # The server may be in a bad state; start a fresh one next time
+        await _todoist_session.close()
         return {
             "success": False,
             "task_count": 0,
@@ -110,24 +205,13 @@ async def mark_todoist_task_complete(task_id: str) -> dict[str, Any]:
         }
     
     try:
-        from mcp import ClientSession, StdioServerParameters
-        from mcp.client.stdio import stdio_client
+        session = await _todoist_session.get()
         
-        server_params = StdioServerParameters(
-            command="npx",
-            args=["-y", "@modelcontextprotocol/server-todoist"],
-            env={"TODOIST_API_TOKEN": TODOIST_API_TOKEN},
+        await session.call_tool(
+            "complete_task",
+            arguments={"task_id": task_id}
         )
         
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                
-                await session.call_tool(
-                    "complete_task",
-                    arguments={"task_id": task_id}
-                )
-        
         return {
             "success": True,
             "message": f"Marked task {task_id} as complete",
@@ -135,6 +219,7 @@ async def mark_todoist_task_complete(task_id: str) -> dict[str, Any]:
     
     except Exception as e:
         logger.error(f"Failed to complete task: {e}")
+        await _todoist_session.close()
         return {
             "success": False,
             "message": f"Failed to complete task: {str(e)}",
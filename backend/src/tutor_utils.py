@@ -3,6 +3,7 @@
 import json
 import logging
 import random
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -12,13 +13,30 @@ logger = logging.getLogger("tutor_utils")
 CONTENT_FILE = Path(__file__).parent.parent / "shared-data" / "day4_tutor_content.json"
 
 
+def _content_mtime() -> int | None:
+    """Return the content file's modification time, used to key derived caches."""
+    try:
+        return CONTENT_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 def load_concepts() -> list[dict[str, Any]]:
     """Load all learning concepts from the JSON file.
     
+    The parsed list is cached until the content file changes, so callers share
+    it and must not modify it.
+    
     Returns:
         List of concept dictionaries
     """
-    if not CONTENT_FILE.exists():
+    return _load_concepts(_content_mtime())
+
+
+@lru_cache(maxsize=1)
+def _load_concepts(mtime_ns: int | None) -> list[dict[str, Any]]:
+    """Read and parse the content file; cached per file modification time."""
+    if mtime_ns is None:
         logger.error(f"Content file not found: {CONTENT_FILE}")
         return []
     
@@ -44,15 +62,23 @@ def get_concept_by_id(concept_id: str) -> dict[str, Any] | None:
     Returns:
         Concept dictionary or None if not found
     """
-    concepts = load_concepts()
-    for concept in concepts:
-        if concept.get("id") == concept_id:
-            return concept
+    concept = _id_index(_content_mtime()).get(concept_id)
+    if concept is not None:
+        return concept
     
     logger.warning(f"Concept not found: {concept_id}")
     return None
 
 
+@lru_cache(maxsize=1)
+def _id_index(mtime_ns: int | None) -> dict[str, dict[str, Any]]:
+    """Map concept IDs to concepts, first one winning; cached until the content file changes."""
+    index = {}
+    for concept in load_concepts():
+        index.setdefault(concept.get("id"), concept)
+    return index
+
+
 def get_random_concept() -> dict[str, Any] | None:
     """Get a random concept from the content file.
     
@@ -74,8 +100,17 @@ def get_concepts_by_difficulty(difficulty: str) -> list[dict[str, Any]]:
     Returns:
         List of matching concepts
     """
-    concepts = load_concepts()
-    return [c for c in concepts if c.get("difficulty") == difficulty]
+    # Copied so callers can't modify the cached group
+    return list(_difficulty_index(_content_mtime()).get(difficulty, ()))
+
+
+@lru_cache(maxsize=1)
+def _difficulty_index(mtime_ns: int | None) -> dict[str, list[dict[str, Any]]]:
+    """Group concepts by difficulty in file order; cached until the content file changes."""
+    index = {}
+    for concept in load_concepts():
+        index.setdefault(concept.get("difficulty"), []).append(concept)
+    return index
 
 
 def format_concept_for_learning(concept: dict[str, Any]) -> str:
@@ -135,6 +170,12 @@ def get_concept_list_text() -> str:
     Returns:
         Text listing all concepts
     """
+    return _concept_list_text(_content_mtime())
+
+
+@lru_cache(maxsize=1)
+def _concept_list_text(mtime_ns: int | None) -> str:
+    """Build the concept list text; cached until the content file changes."""
     concepts = load_concepts()
     if not concepts:
         return "No concepts available."
@@ -160,18 +201,41 @@ def find_concept_by_keyword(keyword: str) -> dict[str, Any] | None:
     Returns:
         Matching concept or None
     """
-    concepts = load_concepts()
     keyword_lower = keyword.lower()
     
-    # First try exact ID match
-    for concept in concepts:
-        if concept.get("id", "").lower() == keyword_lower:
-            return concept
+    # First try an exact ID or title word match
+    concept = _keyword_index(_content_mtime()).get(keyword_lower)
+    if concept is not None:
+        return concept
     
-    # Then try title match
-    for concept in concepts:
-        title = concept.get("title", "").lower()
-        if keyword_lower in title:
+    # Then try a partial title match
+    for title_lower, concept in _title_index(_content_mtime()):
+        if keyword_lower in title_lower:
             return concept
     
     return None
+
+
+@lru_cache(maxsize=1)
+def _keyword_index(mtime_ns: int | None) -> dict[str, dict[str, Any]]:
+    """Map lowercase concept IDs and title words to concepts.
+    
+    IDs are indexed first so they win over title words; among title words the
+    first concept wins. Cached until the content file changes.
+    """
+    concepts = load_concepts()
+    index = {}
+    for concept in concepts:
+        concept_id = concept.get("id", "").lower()
+        if concept_id:
+            index.setdefault(concept_id, concept)
+    for concept in concepts:
+        for word in concept.get("title", "").lower().split():
+            index.setdefault(word, concept)
+    return index
+
+
+@lru_cache(maxsize=1)
+def _title_index(mtime_ns: int | None) -> tuple[tuple[str, dict[str, Any]], ...]:
+    """Pair each concept with its lowercase title, in file order; cached until the content file changes."""
+    return tuple((concept.get("title", "").lower(), concept) for concept in load_concepts())
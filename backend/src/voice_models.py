@@ -0,0 +1,19 @@
+"""Voice pipeline models shared by the agents running in a worker process."""
+
+from functools import lru_cache
+
+from livekit.plugins import silero
+
+
+@lru_cache(maxsize=1)
+def load_vad() -> silero.VAD:
+    """Load the Silero VAD once per worker process.
+
+    Every agent whose prewarm runs in the same process (for example the SDR and
+    fraud agents under a thread job executor) shares this one model.
+
+    The turn detector is not cached here: MultilingualModel binds to the current
+    job's inference executor, and its weights already live once in the worker's
+    shared inference process.
+    """
+    return silero.VAD.load()
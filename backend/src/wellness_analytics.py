@@ -2,15 +2,20 @@
 
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger("wellness_analytics")
 
+# Session dates never change once logged, and every analytics call re-filters the
+# whole history, so parsed dates are memoized. Failed parses raise and are not cached.
+_parse_isoformat = lru_cache(maxsize=4096)(datetime.fromisoformat)
+
 
 def parse_date(date_str: str) -> datetime:
     """Parse ISO format date string to datetime object."""
     try:
-        return datetime.fromisoformat(date_str)
+        return _parse_isoformat(date_str)
     except (ValueError, TypeError):
         logger.warning(f"Could not parse date: {date_str}")
         return datetime.now()
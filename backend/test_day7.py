@@ -153,6 +153,64 @@ class TestCartManagement:
         assert agent.cart[0]["id"] == "2", "Remaining item should be Item 2"
 
 
+class TestCartIndex:
+    """Test that cart tools follow the cart after it is reassigned."""
+    
+    @staticmethod
+    def _entry(agent, name, quantity):
+        item = agent._find_item_by_name(name)
+        return {
+            "id": item["id"],
+            "name": item["name"],
+            "brand": item["brand"],
+            "size": item["size"],
+            "price": item["price"],
+            "quantity": quantity,
+        }
+    
+    async def test_add_after_cart_cleared(self, agent):
+        """Test that adding an item after clearing the cart creates a new entry."""
+        await FoodGroceryAgent.add_to_cart(agent, None, "Whole Wheat Bread", 2)
+        agent.cart = []
+        
+        await FoodGroceryAgent.add_to_cart(agent, None, "Whole Wheat Bread", 1)
+        
+        assert len(agent.cart) == 1
+        assert agent.cart[0]["quantity"] == 1
+    
+    async def test_add_to_reassigned_cart(self, agent):
+        """Test that adding an item already in a reassigned cart updates that entry."""
+        await FoodGroceryAgent.add_to_cart(agent, None, "Organic Milk", 5)
+        agent.cart = [self._entry(agent, "Organic Milk", 2)]
+        
+        await FoodGroceryAgent.add_to_cart(agent, None, "Organic Milk", 1)
+        
+        assert len(agent.cart) == 1
+        assert agent.cart[0]["quantity"] == 3
+    
+    async def test_update_reassigned_cart(self, agent):
+        """Test that updating a quantity changes the entry in the reassigned cart."""
+        await FoodGroceryAgent.add_to_cart(agent, None, "Whole Wheat Bread", 1)
+        agent.cart = [self._entry(agent, "Whole Wheat Bread", 1)]
+        
+        await FoodGroceryAgent.update_quantity(agent, None, "Whole Wheat Bread", 4)
+        
+        assert agent.cart[0]["quantity"] == 4
+        assert agent._calculate_cart_total() == round(agent.cart[0]["price"] * 4, 2)
+    
+    async def test_remove_from_reassigned_cart(self, agent):
+        """Test that removing an item from a reassigned cart also drops it from the index."""
+        await FoodGroceryAgent.add_to_cart(agent, None, "Whole Wheat Bread", 1)
+        agent.cart = [self._entry(agent, "Whole Wheat Bread", 2), self._entry(agent, "Organic Milk", 1)]
+        
+        await FoodGroceryAgent.remove_from_cart(agent, None, "Whole Wheat Bread")
+        assert [item["name"] for item in agent.cart] == ["Organic Milk"]
+        
+        await FoodGroceryAgent.add_to_cart(agent, None, "Whole Wheat Bread", 1)
+        assert len(agent.cart) == 2
+        assert agent.cart[-1]["quantity"] == 1
+
+
 class TestIngredientBundling:
     """Test intelligent ingredient bundling for dishes."""
     
@@ -170,6 +228,15 @@ class TestIngredientBundling:
             for item_id in item_ids:
                 item = agent._find_item_by_id(item_id)
                 assert item is not None, f"Recipe '{recipe_name}' references non-existent item '{item_id}'"
+    
+    def test_recipe_lookup_after_history_reassigned(self, agent):
+        """Test that recipe lookups use the current order history."""
+        agent.order_history = {"orders": [], "recipes": {"Toast": ["bread-001"]}}
+        assert agent._find_recipe("toast") == ("Toast", ["bread-001"])
+        
+        agent.order_history = {"orders": [], "recipes": {"Soup": ["veg-001"]}}
+        assert agent._find_recipe("toast") == (None, None)
+        assert agent._find_recipe("soup") == ("Soup", ["veg-001"])
 
 
 class TestOrderPlacement:
@@ -254,6 +321,53 @@ class TestOrderTracking:
         assert order["status"] == initial_status, "Delivered status should not change"
 
 
+class TestOrderArchive:
+    """Test archiving old orders and tracking them afterwards."""
+    
+    @pytest.fixture
+    def archive_agent(self, agent, tmp_path, monkeypatch):
+        """Agent whose order history and archive live in a temporary directory."""
+        import day7_agent
+        monkeypatch.setattr(day7_agent, "ORDER_HISTORY_FILE", tmp_path / "order_history.json")
+        monkeypatch.setattr(day7_agent, "ORDER_ARCHIVE_FILE", tmp_path / "order_history_archive.jsonl")
+        monkeypatch.setattr(day7_agent, "MAX_RECENT_ORDERS", 3)
+        agent.order_history = {"orders": [], "recipes": {}}
+        return agent
+    
+    @staticmethod
+    def _make_order(n):
+        return {
+            "id": f"order_{n}",
+            "timestamp": (datetime.now() - timedelta(hours=1)).isoformat(),
+            "items": [],
+            "total": 10.00,
+            "status": "received",
+            "status_history": [],
+        }
+    
+    async def test_track_archived_order(self, archive_agent):
+        """Test that orders beyond MAX_RECENT_ORDERS are archived and still trackable."""
+        import day7_agent
+        for n in range(5):
+            archive_agent.order_history["orders"].append(self._make_order(n))
+        archive_agent._archive_old_orders()
+        
+        orders = archive_agent.order_history["orders"]
+        assert [o["id"] for o in orders] == ["order_2", "order_3", "order_4"]
+        assert archive_agent.order_history["archived_count"] == 2
+        assert day7_agent.ORDER_ARCHIVE_FILE.read_text().count("\n") == 2
+        
+        archive_agent._history_dirty = False
+        response = await FoodGroceryAgent.track_order(archive_agent, None, "order_0")
+        assert "Order ID: order_0" in response
+        assert "Received" in response
+        # An archived order is a read-only copy; tracking it changes nothing in history
+        assert not archive_agent._history_dirty
+        
+        response = await FoodGroceryAgent.track_order(archive_agent, None, "order_99")
+        assert "couldn't find" in response
+
+
 class TestBudgetTracking:
     """Test budget tracking functionality."""
     
@@ -0,0 +1,42 @@
+"""Tests for day 9 order IDs."""
+
+import pytest
+
+import day9_merchant
+
+
+@pytest.fixture
+def orders_file(tmp_path, monkeypatch):
+    """Keep orders in a temporary log, with no legacy file."""
+    path = tmp_path / "ecommerce_orders.jsonl"
+    monkeypatch.setattr(day9_merchant, "ORDERS_FILE", str(path))
+    monkeypatch.setattr(day9_merchant, "LEGACY_ORDERS_FILE", str(tmp_path / "ecommerce_orders.json"))
+    return path
+
+
+def _place_orders(manager, count):
+    return [
+        manager.create_order([{"product_id": "mug_001", "quantity": 1}])["id"]
+        for _ in range(count)
+    ]
+
+
+def test_order_ids_are_short(orders_file):
+    ids = _place_orders(day9_merchant.OrderManager(), 3)
+
+    for order_id in ids:
+        assert order_id.startswith("ORD-")
+        assert len(order_id) == len("ORD-") + 8
+
+
+def test_order_ids_stay_unique_across_reload(orders_file):
+    first = _place_orders(day9_merchant.OrderManager(), 5)
+
+    # A reloaded manager starts its counter over with the same prefix
+    reloaded = day9_merchant.OrderManager()
+    assert [o["id"] for o in reloaded.orders] == first
+    second = _place_orders(reloaded, 5)
+
+    ids = first + second
+    assert len(set(ids)) == len(ids)
+    assert all(len(order_id) == len("ORD-") + 8 for order_id in ids)
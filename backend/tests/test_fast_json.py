@@ -0,0 +1,48 @@
+"""Tests for the fast_json helpers."""
+
+import os
+import stat
+
+import pytest
+
+import fast_json
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_write_atomic_round_trip(tmp_path):
+    path = tmp_path / "data.json"
+    fast_json.write_atomic(path, {"a": [1, 2]}, indent=True)
+
+    assert fast_json.loads(path.read_text()) == {"a": [1, 2]}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_write_atomic_keeps_existing_mode(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("[]")
+    os.chmod(path, 0o640)
+
+    fast_json.write_atomic(path, [1])
+
+    assert _mode(path) == 0o640
+
+
+def test_write_atomic_new_file_uses_umask(tmp_path):
+    path = tmp_path / "data.json"
+    fast_json.write_atomic(path, [1])
+
+    assert _mode(path) == 0o666 & ~fast_json._UMASK
+
+
+def test_write_atomic_removes_temp_file_on_error(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("[]")
+
+    with pytest.raises(TypeError):
+        fast_json.write_atomic(path, {"bad": object()})
+
+    assert path.read_text() == "[]"
+    assert os.listdir(tmp_path) == ["data.json"]
@@ -0,0 +1,81 @@
+"""Tests for the day 6 fraud alert tool gating by call stage."""
+
+import json
+
+import pytest
+
+import day6_agent
+from day6_agent import STAGE_TOOLS, FraudAlertAgent
+
+CASE = {
+    "id": 1,
+    "userName": "John Smith",
+    "securityIdentifier": "12345",
+    "cardEnding": "4242",
+    "transactionName": "ABC Industry",
+    "transactionAmount": "1,250.00",
+    "transactionTime": "2024-01-15 14:30:00",
+    "transactionCategory": "e-commerce",
+    "transactionSource": "alibaba.com",
+    "location": "Shanghai, China",
+    "status": "pending_review",
+}
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    """Agent reading and writing a one-case database in a temporary directory."""
+    cases_file = tmp_path / "fraud_cases.json"
+    cases_file.write_text(json.dumps([CASE]))
+    monkeypatch.setattr(day6_agent, "FRAUD_CASES_FILE", cases_file)
+    monkeypatch.setattr(
+        day6_agent, "_cases_cache", {"mtime": None, "data": None, "positions": {}, "by_username": {}}
+    )
+    return FraudAlertAgent(room=None)
+
+
+def _exposed(agent):
+    return {tool.id for tool in agent.tools}
+
+
+def test_stage_tools_exist(agent):
+    for stage, names in STAGE_TOOLS.items():
+        for name in names:
+            assert name in agent._tools_by_name, f"{stage} lists unknown tool {name}"
+
+
+async def test_stages_expose_their_tools(agent):
+    await agent.on_enter()
+    assert agent.stage == "intro"
+    assert _exposed(agent) == {"load_fraud_case", "end_call"}
+
+    await FraudAlertAgent.load_fraud_case(agent, None, "john smith")
+    assert agent.stage == "loaded"
+    assert _exposed(agent) == {"load_fraud_case", "verify_customer", "end_call"}
+
+    # A wrong answer keeps the case locked
+    await FraudAlertAgent.verify_customer(agent, None, "00000")
+    assert agent.stage == "loaded"
+    assert not _exposed(agent) & {"mark_transaction_safe", "mark_transaction_fraudulent"}
+
+    await FraudAlertAgent.verify_customer(agent, None, "12345")
+    assert agent.stage == "verified"
+    assert _exposed(agent) == {
+        "get_transaction_details",
+        "mark_transaction_safe",
+        "mark_transaction_fraudulent",
+        "end_call",
+    }
+
+
+async def test_terminal_stage_reaches_outcome(agent):
+    await agent.on_enter()
+    await FraudAlertAgent.load_fraud_case(agent, None, "John Smith")
+    await FraudAlertAgent.verify_customer(agent, None, "12345")
+
+    assert "mark_transaction_fraudulent" in _exposed(agent)
+    await FraudAlertAgent.mark_transaction_fraudulent(agent, None)
+
+    saved = json.loads(day6_agent.FRAUD_CASES_FILE.read_text())
+    assert saved[0]["status"] == "confirmed_fraud"
+    assert "end_call" in _exposed(agent)
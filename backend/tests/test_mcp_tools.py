@@ -0,0 +1,47 @@
+"""Tests for the warm Todoist MCP session."""
+
+import asyncio
+
+import pytest
+
+import mcp_tools
+
+
+@pytest.fixture
+def todoist(monkeypatch):
+    """A session whose runner stands in for the MCP server process."""
+    async def fake_run(self, ready, closing):
+        session = object()
+        self._session = session
+        ready.set_result(session)
+        await closing.wait()
+        if self._session is session:
+            self._session = None
+
+    monkeypatch.setattr(mcp_tools._TodoistSession, "_run", fake_run)
+    return mcp_tools._TodoistSession()
+
+
+def test_session_is_reused_on_one_loop(todoist):
+    async def main():
+        first = await todoist.get()
+        second = await todoist.get()
+        await todoist.close()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first is second
+
+
+def test_session_survives_a_new_event_loop(todoist):
+    # The first loop ends without closing the session, like a finished worker job
+    first = asyncio.run(todoist.get())
+
+    async def main():
+        session = await todoist.get()
+        await todoist.close()
+        return session
+
+    second = asyncio.run(main())
+    assert second is not None
+    assert second is not first
@@ -11,6 +11,7 @@ from wellness_analytics import (
     filter_recent_sessions,
     generate_weekly_insights,
     get_common_stressors,
+    parse_date,
 )
 
 
@@ -27,6 +28,20 @@ def create_sample_session(days_ago=0, mood="good", energy="medium", goals=None,
     }
 
 
+class TestParseDate:
+    def test_parses_iso_date(self):
+        result = parse_date("2025-11-18T10:30:00+05:30")
+        assert result == datetime.fromisoformat("2025-11-18T10:30:00+05:30")
+
+    def test_repeated_parse_returns_same_value(self):
+        assert parse_date("2025-11-19T09:15:00") == parse_date("2025-11-19T09:15:00")
+
+    def test_invalid_date_falls_back_to_now(self):
+        before = datetime.now()
+        result = parse_date("not a date")
+        assert before <= result <= datetime.now()
+
+
 class TestFilterRecentSessions:
     def test_empty_history(self):
         result = filter_recent_sessions([], days=7)
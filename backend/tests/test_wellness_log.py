@@ -0,0 +1,75 @@
+"""Tests for the day 3 wellness log and its migration from the legacy JSON file."""
+
+import json
+
+import pytest
+
+import day3_agent
+
+
+@pytest.fixture
+def log_paths(tmp_path, monkeypatch):
+    """Point the wellness log and the legacy log at a temporary directory."""
+    log = tmp_path / "wellness_log.jsonl"
+    legacy = tmp_path / "wellness_log.json"
+    monkeypatch.setattr(day3_agent, "WELLNESS_LOG", log)
+    monkeypatch.setattr(day3_agent, "LEGACY_WELLNESS_LOG", legacy)
+    day3_agent._HISTORY_CACHE.clear()
+    return log, legacy
+
+
+def _load_history():
+    return day3_agent.WellnessCompanion._load_history(None)
+
+
+def test_load_history_skips_bad_lines(log_paths):
+    log, _ = log_paths
+    log.write_text('{"mood": "good"}\n\nnot json\n{"mood": "tired"}\n{"mood": "par')
+
+    assert _load_history() == [{"mood": "good"}, {"mood": "tired"}]
+
+
+def test_migration_keeps_newer_check_ins(log_paths):
+    log, legacy = log_paths
+    legacy.write_text(json.dumps([{"mood": "old1"}, {"mood": "old2"}]))
+    log.write_text('{"mood": "new"}\n{"mood": "par')
+
+    assert _load_history() == [{"mood": "old1"}, {"mood": "old2"}, {"mood": "new"}]
+    assert not legacy.exists()
+    assert legacy.with_name("wellness_log.json.migrated").exists()
+    assert log.read_text() == '{"mood":"old1"}\n{"mood":"old2"}\n{"mood":"new"}\n'
+
+
+def test_second_migration_run_does_nothing(log_paths):
+    log, legacy = log_paths
+    legacy.write_text(json.dumps([{"mood": "old"}]))
+    day3_agent._migrate_legacy_log()
+    contents = log.read_text()
+
+    day3_agent._migrate_legacy_log()
+
+    assert log.read_text() == contents
+    assert _load_history() == [{"mood": "old"}]
+
+
+def test_migration_after_crash_before_rename_does_not_duplicate(log_paths):
+    log, legacy = log_paths
+    legacy.write_text(json.dumps([{"mood": "old"}]))
+    # The log was already replaced, but the legacy file was never renamed
+    log.write_text('{"mood":"old"}\n{"mood":"new"}\n')
+
+    assert _load_history() == [{"mood": "old"}, {"mood": "new"}]
+    assert not legacy.exists()
+
+
+def test_corrupt_legacy_log_is_retried(log_paths):
+    log, legacy = log_paths
+    legacy.write_text("[{bad")
+    log.write_text('{"mood": "new"}\n')
+
+    assert _load_history() == [{"mood": "new"}]
+    assert legacy.exists()
+
+    legacy.write_text(json.dumps([{"mood": "old"}]))
+
+    assert _load_history() == [{"mood": "old"}, {"mood": "new"}]
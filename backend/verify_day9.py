@@ -53,12 +53,12 @@ def test_ecommerce_flow():
     assert "Cart User" in summary
 
     # 5. Verify Persistence
-    print("\n5. Verifying Persistence in shared-data/ecommerce_orders.json...")
+    print("\n5. Verifying Persistence in shared-data/ecommerce_orders.jsonl...")
     # shared-data is in backend/shared-data
-    orders_file = os.path.join(os.path.dirname(__file__), "shared-data", "ecommerce_orders.json")
+    orders_file = os.path.join(os.path.dirname(__file__), "shared-data", "ecommerce_orders.jsonl")
          
     with open(orders_file, "r") as f:
-        orders = json.load(f)
+        orders = [json.loads(line) for line in f if line.strip()]
         print(f"Found {len(orders)} orders in file.")
         last_order = orders[-1]
         assert len(last_order["items"]) == 2 # Hoodie + Sticker